@@ -0,0 +1,118 @@
+"""Hot order-query latency before and after archiving old orders.
+
+Bulk-loads --orders orders spread over the last --days days (older ones are
+mostly completed/cancelled), times the queries behind GET /api/my-orders and
+GET /api/orders, runs archive.archive_orders() and times them again.
+
+    python bench/archive_bench.py --orders 5000000
+    python bench/archive_bench.py --orders 200000 --samples 50   # quick run
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import percentile, prepare_workdir  # noqa: E402
+
+CHUNK = 50_000
+
+def load_orders(engine, models, rng, orders, users, days):
+    now = datetime.utcnow()
+    table = models.Order.__table__
+    with engine.begin() as conn:
+        conn.execute(models.User.__table__.insert(), [
+            {"username": f"customer{i}", "hashed_password": "x", "is_admin": False}
+            for i in range(users)
+        ])
+        for start in range(0, orders, CHUNK):
+            rows = []
+            for _ in range(min(CHUNK, orders - start)):
+                age = rng.random() * days
+                if age > 14:
+                    status = "completed" if rng.random() < 0.9 else "cancelled"
+                else:
+                    status = rng.choice(("pending", "processing", "completed", "cancelled"))
+                rows.append({
+                    "user_id": rng.randint(2, users + 1) if rng.random() < 0.7 else None,
+                    "customer_name": "Bench Customer",
+                    "customer_phone": f"017{rng.randint(0, 99_999_999):08d}",
+                    "customer_address": "Bench Road, Dhaka",
+                    "total_amount": rng.randint(5, 200) * 1000.0,
+                    "items": '[{"id": 1, "name": "Bed", "price": 1000.0, "quantity": 1}]',
+                    "status": status,
+                    "created_at": now - timedelta(days=age),
+                })
+            conn.execute(table.insert(), rows)
+
+def time_queries(db, models, rng, users, samples):
+    my_orders, admin_orders = [], []
+    for _ in range(samples):
+        user_id = rng.randint(2, users + 1)
+        start = time.perf_counter()
+        db.query(models.Order).filter(
+            models.Order.user_id == user_id
+        ).order_by(models.Order.created_at.desc()).all()
+        my_orders.append((time.perf_counter() - start) * 1000)
+        db.expunge_all()
+    # The admin list reads every hot order; a few runs are enough. Rows are
+    # streamed and discarded so millions of them don't have to fit in memory.
+    for _ in range(max(1, samples // 20)):
+        start = time.perf_counter()
+        for _row in db.execute(models.Order.__table__.select().order_by(models.Order.created_at.desc())):
+            pass
+        admin_orders.append((time.perf_counter() - start) * 1000)
+    return my_orders, admin_orders
+
+def report(label, samples):
+    print(f"  {label:<12} p50 {statistics.median(samples):9.2f} ms  p99 {percentile(samples, 99):9.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=5_000_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--older-than-days", type=int, default=90)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="Directory for the benchmark database (default: temp dir)")
+    args = parser.parse_args()
+
+    prepare_workdir(args.workdir)
+    import models
+    import archive
+    from database import SessionLocal, engine
+
+    models.Base.metadata.create_all(bind=engine)
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    load_orders(engine, models, rng, args.orders, args.users, args.days)
+    print(f"loaded {args.orders} orders in {time.perf_counter() - start:.1f}s")
+
+    db = SessionLocal()
+    try:
+        before = time_queries(db, models, rng, args.users, args.samples)
+
+        start = time.perf_counter()
+        moved = archive.archive_orders(db, args.older_than_days, args.batch_size)
+        elapsed = time.perf_counter() - start
+        hot = db.query(models.Order).count()
+        print(f"archived {moved} orders in {elapsed:.1f}s ({moved / elapsed:.0f} rows/s); {hot} left in orders")
+
+        after = time_queries(db, models, rng, args.users, args.samples)
+    finally:
+        db.close()
+
+    for title, (my_orders, admin_orders) in (("before archival", before), ("after archival", after)):
+        print(title)
+        report("my-orders", my_orders)
+        report("admin list", admin_orders)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Refreshing a 20-item cart: GET /api/products/{id} per item vs one
+GET /api/products/batch vs the whole catalog.
+
+    python bench/batch_bench.py --products 2000 --cart 20 --rounds 200
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import percentile, prepare_workdir  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--cart", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    os.environ.setdefault("RATE_LIMITS_ENABLED", "0")
+    from fastapi.testclient import TestClient
+    import main as server_main
+    import models
+    from database import engine
+
+    with engine.begin() as conn:
+        conn.execute(models.Product.__table__.insert(), [
+            {"nameEn": f"Product {i}", "nameBn": f"পণ্য {i}", "price": 1000.0 + i, "category": "bed",
+             "descriptionEn": "Solid wood, hand polished. " * 8, "descriptionBn": "মজবুত কাঠ। " * 8,
+             "image": f"/static/uploads/{i:08d}.jpg"}
+            for i in range(args.products)
+        ])
+
+    rng = random.Random(args.seed)
+    strategies = {
+        f"{args.cart} x GET /products/{{id}}": lambda client, ids: [
+            client.get(f"/api/products/{i}").raise_for_status() for i in ids
+        ],
+        "1 x GET /products/batch": lambda client, ids: client.get(
+            "/api/products/batch", params={"ids": ",".join(map(str, ids))}
+        ).raise_for_status(),
+        "1 x GET /products/batch?lang=en": lambda client, ids: client.get(
+            "/api/products/batch", params={"ids": ",".join(map(str, ids)), "lang": "en"}
+        ).raise_for_status(),
+        "1 x GET /products (catalog)": lambda client, ids: client.get("/api/products").raise_for_status(),
+    }
+
+    print(f"{args.products} products, cart of {args.cart}, {args.rounds} rounds")
+    with TestClient(server_main.app) as client:
+        for label, fetch in strategies.items():
+            latencies = []
+            for _ in range(args.rounds):
+                ids = rng.sample(range(1, args.products + 1), args.cart)
+                start = time.perf_counter()
+                fetch(client, ids)
+                latencies.append((time.perf_counter() - start) * 1000)
+            print(f"{label:<34} p50 {statistics.median(latencies):8.2f} ms  p99 {percentile(latencies, 99):8.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SERVER_DIR = ROOT_DIR / "server"
+
+def use_server_modules():
+    """Make the server's top-level modules (models, database, ...) importable"""
+    if str(SERVER_DIR) not in sys.path:
+        sys.path.insert(0, str(SERVER_DIR))
+
+def prepare_workdir(workdir=None, database=None) -> Path:
+    """Switch to a scratch directory and point DATABASE_URL at a SQLite file in it.
+
+    Must run before importing `database`, which reads DATABASE_URL at import time.
+    """
+    path = Path(workdir).resolve() if workdir else Path(tempfile.mkdtemp(prefix="rubel-bench-"))
+    db_file = Path(database).resolve() if database else path / "bench.db"
+    path.mkdir(parents=True, exist_ok=True)
+    os.chdir(path)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{db_file}")
+    use_server_modules()
+    return path
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summarize(latencies_ms, elapsed_s, errors=0):
+    return {
+        "requests": len(latencies_ms),
+        "errors": errors,
+        "throughput_rps": round(len(latencies_ms) / elapsed_s, 2) if elapsed_s else 0.0,
+        "p50_ms": round(statistics.median(latencies_ms), 3) if latencies_ms else 0.0,
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
@@ -0,0 +1,38 @@
+"""Compare two bench/run.py result files.
+
+    python bench/compare.py before.json after.json
+"""
+import argparse
+import json
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+
+def change(before, after):
+    if not before:
+        return "   n/a"
+    return f"{(after - before) / before * 100:+6.1f}%"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"{before.get('revision', '?')} -> {after.get('revision', '?')}")
+    print(f"{'scenario':16} " + "  ".join(f"{metric:>30}" for metric in METRICS))
+    for name in sorted(set(before["scenarios"]) | set(after["scenarios"])):
+        old = before["scenarios"].get(name)
+        new = after["scenarios"].get(name)
+        if not old or not new:
+            print(f"{name:16} only in {'after' if new else 'before'}")
+            continue
+        cells = [f"{old[m]:9.2f} -> {new[m]:9.2f} {change(old[m], new[m])}" for m in METRICS]
+        print(f"{name:16} " + "  ".join(cells))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Request deadlines: a query slower than REQUEST_TIMEOUT_SECONDS is cancelled.
+
+Loads --orders orders so GET /api/stats (full scans) runs well past the
+budget, then fires --concurrent such requests at once and checks that each
+gets a 503 near the deadline, that no pooled connection is left checked out,
+that the timeout is counted in /metrics, and that a cheap request still goes
+through right afterwards. Finally measures what the SQLite progress handler
+costs a query that finishes in time.
+
+    python bench/deadline_bench.py --orders 2000000 --timeout 0.25
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import prepare_workdir  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2_000_000)
+    parser.add_argument("--timeout", type=float, default=0.25)
+    parser.add_argument("--concurrent", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    os.environ.setdefault("RATE_LIMITS_ENABLED", "0")
+    os.environ["REQUEST_TIMEOUT_SECONDS"] = str(args.timeout)
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+    import main as server_main
+    import deadlines
+    import models
+    from database import engine, SessionLocal
+
+    batch = 100_000
+    with engine.begin() as conn:
+        for offset in range(0, args.orders, batch):
+            conn.execute(models.Order.__table__.insert(), [
+                {"customer_name": "Bench", "customer_phone": f"017{i % 500_000:08d}", "total_amount": 1000.0,
+                 "items": "[]", "status": "completed"}
+                for i in range(offset, min(args.orders, offset + batch))
+            ])
+
+    # The same statements get_stats runs, without a deadline
+    stats_sql = text(
+        "SELECT count(*) FROM (SELECT customer_phone FROM orders UNION SELECT customer_phone FROM orders_archive)"
+    )
+    db = SessionLocal()
+    start = time.perf_counter()
+    db.execute(stats_sql).scalar()
+    unbounded = time.perf_counter() - start
+    db.close()
+    print(f"{args.orders:,} orders; distinct-customer scan takes {unbounded * 1000:,.0f} ms with no deadline, "
+          f"REQUEST_TIMEOUT_SECONDS={args.timeout}")
+
+    with TestClient(server_main.app) as client:
+        token = client.post("/api/auth/login", data={"username": "admin", "password": "admin123"}).json()
+        auth = {"Authorization": f"Bearer {token['access_token']}"}
+
+        def slow_request():
+            start = time.perf_counter()
+            response = client.get("/api/stats", headers=auth)
+            return response.status_code, time.perf_counter() - start
+
+        with ThreadPoolExecutor(args.concurrent) as pool:
+            results = list(pool.map(lambda _: slow_request(), range(args.concurrent)))
+        statuses = sorted({status for status, _ in results})
+        latencies = [elapsed * 1000 for _, elapsed in results]
+        print(f"{args.concurrent} concurrent GET /api/stats: status {statuses}, "
+              f"{min(latencies):,.0f}-{max(latencies):,.0f} ms")
+
+        checked_out = engine.pool.checkedout()
+        start = time.perf_counter()
+        follow_up = client.get("/api/products").status_code
+        follow_up_ms = (time.perf_counter() - start) * 1000
+        timed_out = deadlines.requests_timed_out_total.get("GET", "/api/stats")
+        print(f"pooled connections still checked out: {checked_out}; "
+              f"next GET /api/products: {follow_up} in {follow_up_ms:.1f} ms; "
+              f"http_requests_timed_out_total{{route=/api/stats}} = {timed_out:.0f}")
+        ok = statuses == [503] and checked_out == 0 and follow_up == 200 and timed_out == args.concurrent
+
+    # Progress handler overhead on a query that finishes within its budget
+    count_sql = text("SELECT count(*), sum(total_amount) FROM orders")
+    timings = {}
+    for label, deadline in (("no deadline", None), ("deadline set", deadlines.Deadline(3600))):
+        samples = []
+        for _ in range(args.rounds):
+            db = SessionLocal()
+            db.info["deadline"] = deadline
+            start = time.perf_counter()
+            db.execute(count_sql).one()
+            samples.append((time.perf_counter() - start) * 1000)
+            db.close()
+        timings[label] = statistics.median(samples)
+        print(f"full count+sum, {label:<13} p50 {timings[label]:8.1f} ms")
+    print(f"progress handler overhead: {timings['deadline set'] / timings['no deadline'] - 1:+.1%}")
+
+    print("✅ worker and connection released" if ok else "❌ deadline not enforced as expected")
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Simultaneous duplicate POST /api/orders with Idempotency-Key.
+
+For each of --keys keys, fires --duplicates identical requests at once and
+checks exactly one order was written per key; also reports first-request vs
+replay latency.
+
+    python bench/idempotency_bench.py --keys 200 --duplicates 8
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import percentile, prepare_workdir  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--duplicates", type=int, default=8)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    os.environ.setdefault("RATE_LIMITS_ENABLED", "0")
+    from fastapi.testclient import TestClient
+    import main as server_main
+    import models
+    from database import SessionLocal
+
+    order = {
+        "customer_name": "Bench Customer",
+        "customer_phone": "01700000000",
+        "customer_address": "Bench Road, Dhaka",
+        "total_amount": 1000.0,
+        "items": json.dumps([{"id": 1, "name": "Bed", "price": 1000.0, "quantity": 1}]),
+    }
+
+    with TestClient(server_main.app) as client:
+        token = client.post("/api/auth/login", data={"username": "admin", "password": "admin123"}).json()
+        auth = {"Authorization": f"Bearer {token['access_token']}"}
+
+        def post(key):
+            start = time.perf_counter()
+            response = client.post("/api/orders", json=order, headers={**auth, "Idempotency-Key": key})
+            return response, (time.perf_counter() - start) * 1000
+
+        first, replays, statuses, order_ids = [], [], {}, {}
+        with ThreadPoolExecutor(max_workers=args.duplicates) as pool:
+            for _ in range(args.keys):
+                key = str(uuid.uuid4())
+                for response, elapsed in pool.map(post, [key] * args.duplicates):
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    if response.status_code == 200:
+                        order_ids.setdefault(key, set()).add(response.json()["order_id"])
+                    (replays if response.headers.get("idempotent-replayed") else first).append(elapsed)
+
+    db = SessionLocal()
+    try:
+        orders_written = db.query(models.Order).count()
+    finally:
+        db.close()
+
+    conflicting = sum(1 for ids in order_ids.values() if len(ids) > 1)
+    print(f"requests: {args.keys * args.duplicates}  statuses: {statuses}")
+    print(f"orders written: {orders_written} (expected {args.keys})  keys answered with >1 order id: {conflicting}")
+    print(f"first request  p50 {statistics.median(first):.2f} ms  p99 {percentile(first, 99):.2f} ms")
+    if replays:
+        print(f"replay         p50 {statistics.median(replays):.2f} ms  p99 {percentile(replays, 99):.2f} ms")
+    # The pass/fail check lives in server/tests/test_idempotency.py; still flag it here
+    if orders_written != args.keys or conflicting:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
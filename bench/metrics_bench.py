@@ -0,0 +1,69 @@
+"""Benchmark the overhead of the metrics middleware on a hot endpoint.
+
+Runs GET /api/products against the in-process app with metrics off, then
+with MetricsMiddleware and pool instrumentation on, and prints both.
+
+    python bench/metrics_bench.py --products 200 --requests 3000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import percentile, prepare_workdir  # noqa: E402
+
+def run(client, path, requests):
+    for _ in range(50):
+        client.get(path)
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        "rps": requests / (sum(latencies) / 1000),
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 99),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    os.environ["METRICS_ENABLED"] = "0"
+
+    from fastapi.testclient import TestClient
+    import main as server_main
+    import metrics
+    import models
+    from database import SessionLocal, engine
+
+    db = SessionLocal()
+    db.add_all(
+        models.Product(nameEn=f"Product {i}", nameBn=f"পণ্য {i}", price=100 + i, category="bed",
+                       descriptionEn="A sturdy wooden piece", descriptionBn="কাঠের তৈরি", image="/static/x.png")
+        for i in range(args.products)
+    )
+    db.commit()
+    db.close()
+
+    with TestClient(server_main.app) as client:
+        off = run(client, "/api/products", args.requests)
+
+    metrics.instrument_engine(engine)
+    with TestClient(metrics.MetricsMiddleware(server_main.app)) as client:
+        on = run(client, "/api/products", args.requests)
+
+    for label, result in (("metrics off", off), ("metrics on", on)):
+        print(f"{label:12} {result['rps']:8.1f} req/s  p50 {result['p50']:.3f} ms  p99 {result['p99']:.3f} ms")
+    print(f"p50 overhead: {(on['p50'] - off['p50']) / off['p50'] * 100:+.2f}%")
+
+if __name__ == "__main__":
+    main()
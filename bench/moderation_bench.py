@@ -0,0 +1,82 @@
+"""1,000 review moderations and order status changes: one request each vs bulk.
+
+Times PUT /api/admin/reviews/{id} and PUT /api/orders/{id} per row against a
+single POST /api/admin/reviews/bulk and POST /api/orders/bulk-status.
+
+    python bench/moderation_bench.py --rows 1000
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import prepare_workdir  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    os.environ.setdefault("RATE_LIMITS_ENABLED", "0")
+    from fastapi.testclient import TestClient
+    import main as server_main
+    import models
+    from database import engine
+
+    with TestClient(server_main.app) as client:
+        token = client.post("/api/auth/login", data={"username": "admin", "password": "admin123"}).json()
+        auth = {"Authorization": f"Bearer {token['access_token']}"}
+
+        with engine.begin() as conn:
+            product_id = conn.execute(models.Product.__table__.insert().values(
+                nameEn="Bench Bed", nameBn="বেঞ্চ খাট", price=1000.0, category="bed", image=""
+            )).inserted_primary_key[0]
+
+        def reset_rows():
+            with engine.begin() as conn:
+                conn.execute(models.Review.__table__.delete())
+                conn.execute(models.Order.__table__.delete())
+                conn.execute(models.Review.__table__.insert(), [
+                    {"product_id": product_id, "user_id": 1, "rating": 3, "comment": "ok", "is_approved": True}
+                    for _ in range(args.rows)
+                ])
+                conn.execute(models.Order.__table__.insert(), [
+                    {"customer_name": "Bench", "customer_phone": "01700000000", "total_amount": 1000.0,
+                     "items": "[]", "status": "pending"}
+                    for _ in range(args.rows)
+                ])
+                review_ids = [row[0] for row in conn.execute(models.Review.__table__.select().with_only_columns(models.Review.id))]
+                order_ids = [row[0] for row in conn.execute(models.Order.__table__.select().with_only_columns(models.Order.id))]
+            return review_ids, order_ids
+
+        def timed(label, func):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<32} {elapsed * 1000:10.1f} ms  ({args.rows / elapsed:,.0f} rows/s)")
+            return elapsed
+
+        review_ids, order_ids = reset_rows()
+        single_reviews = timed("reviews, one PUT each", lambda: [
+            client.put(f"/api/admin/reviews/{i}", json={"is_approved": False}, headers=auth) for i in review_ids
+        ])
+        single_orders = timed("orders, one PUT each", lambda: [
+            client.put(f"/api/orders/{i}", json={"status": "completed"}, headers=auth) for i in order_ids
+        ])
+
+        review_ids, order_ids = reset_rows()
+        bulk_reviews = timed("reviews, POST /admin/reviews/bulk", lambda: client.post(
+            "/api/admin/reviews/bulk", json={"action": "reject", "ids": review_ids}, headers=auth
+        ).raise_for_status())
+        bulk_orders = timed("orders, POST /orders/bulk-status", lambda: client.post(
+            "/api/orders/bulk-status", json={"ids": order_ids, "status": "completed"}, headers=auth
+        ).raise_for_status())
+
+    print(f"speedup: reviews {single_reviews / bulk_reviews:.0f}x, orders {single_orders / bulk_orders:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Catalog payload size and response time: full vs ?lang= vs ?fields=.
+
+Loads --products products with English and Bangla names and descriptions,
+then requests GET /api/products in each variant and reports body size and
+latency.
+
+    python bench/payload_bench.py --products 20000 --requests 30
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import percentile, prepare_workdir  # noqa: E402
+
+VARIANTS = [
+    ("full", ""),
+    ("lang=en", "?lang=en"),
+    ("lang=bn", "?lang=bn"),
+    ("lang=en, no description", "?lang=en&fields=id,name,price,image,category"),
+    ("fields=id,name", "?lang=en&fields=id,name"),
+]
+
+WORDS_EN = "solid teak oak walnut hand polished finish drawer storage comfortable modern classic".split()
+WORDS_BN = "সেগুন কাঠ মজবুত আধুনিক ক্লাসিক ড্রয়ার আরামদায়ক পালিশ নকশা টেকসই".split()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    os.environ.setdefault("RATE_LIMITS_ENABLED", "0")
+    from fastapi.testclient import TestClient
+    import main as server_main
+    import models
+    from database import engine
+
+    rng = random.Random(args.seed)
+    with engine.begin() as conn:
+        conn.execute(models.Product.__table__.insert(), [
+            {
+                "nameEn": f"{rng.choice(WORDS_EN).title()} Bed {i}",
+                "nameBn": f"{rng.choice(WORDS_BN)} খাট {i}",
+                "descriptionEn": " ".join(rng.choices(WORDS_EN, k=40)),
+                "descriptionBn": " ".join(rng.choices(WORDS_BN, k=40)),
+                "price": float(rng.randint(5, 200) * 1000),
+                "category": rng.choice(["bed", "sofa", "cupboard", "door", "dining"]),
+                "image": f"/static/uploads/{i:08d}.jpg",
+            }
+            for i in range(args.products)
+        ])
+
+    print(f"{args.products} products, {args.requests} requests per variant")
+    print(f"{'variant':<26} {'bytes':>12} {'vs full':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    full_size = None
+    with TestClient(server_main.app) as client:
+        for label, query in VARIANTS:
+            latencies, size = [], 0
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                response = client.get(f"/api/products{query}")
+                latencies.append((time.perf_counter() - start) * 1000)
+                size = len(response.content)
+            full_size = full_size or size
+            print(f"{label:<26} {size:>12,} {size / full_size:>7.0%} "
+                  f"{statistics.median(latencies):>9.1f} {percentile(latencies, 99):>9.1f}")
+
+if __name__ == "__main__":
+    main()
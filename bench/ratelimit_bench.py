@@ -0,0 +1,96 @@
+"""Catalog latency under an abusive login flood, with admission control on vs off.
+
+Starts server/serve.py (one worker) three times: no flood, flood with rate
+limits on, flood with rate limits off. Flood threads hammer
+POST /api/auth/login with bad passwords while one client measures
+GET /api/products latency.
+
+    python bench/ratelimit_bench.py --flood-threads 16 --duration 10
+"""
+import argparse
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import SERVER_DIR, percentile, prepare_workdir  # noqa: E402
+from workers_bench import wait_until_ready  # noqa: E402
+
+def run_case(args, flood_threads, limits_enabled):
+    import httpx
+    url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, str(SERVER_DIR / "serve.py"), "--workers", "1", "--port", str(args.port),
+         "--log-level", "warning"],
+        env={**os.environ, "RATE_LIMITS_ENABLED": "1" if limits_enabled else "0"},
+    )
+    statuses = Counter()
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def flood(thread_id):
+        local = Counter()
+        with httpx.Client(base_url=url, timeout=60) as client:
+            while not stop.is_set():
+                response = client.post("/api/auth/login",
+                                       data={"username": f"user{thread_id}", "password": "wrong-password"})
+                local[response.status_code] += 1
+        with lock:
+            statuses.update(local)
+
+    try:
+        wait_until_ready(url)
+        threads = [threading.Thread(target=flood, args=(i,)) for i in range(flood_threads)]
+        for thread in threads:
+            thread.start()
+        latencies = []
+        deadline = time.perf_counter() + args.duration
+        with httpx.Client(base_url=url, timeout=60) as client:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                client.get("/api/products")
+                latencies.append((time.perf_counter() - start) * 1000)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return latencies, statuses
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flood-threads", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    import models
+    import seed
+    from database import SessionLocal, engine
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        seed.generate(db, random.Random(42), users=50, products=300, orders=100, reviews=100)
+    finally:
+        db.close()
+    engine.dispose()
+
+    cases = (("no flood", 0, True), ("flood, limits on", args.flood_threads, True),
+             ("flood, limits off", args.flood_threads, False))
+    for label, threads, limits in cases:
+        latencies, statuses = run_case(args, threads, limits)
+        login_summary = ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items())) or "-"
+        print(f"{label:18} catalog p50 {percentile(latencies, 50):8.2f} ms  p99 {percentile(latencies, 99):8.2f} ms"
+              f"  ({len(latencies)} requests)  login responses [{login_summary}]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Frequently-bought-together batch build on synthetic order history.
+
+Bulk-loads --orders orders of 1-5 products (popularity is skewed, and some
+products are usually bought with a "partner"), times a full
+recommendations.rebuild(), an incremental refresh() over --new-orders more
+orders, and the lookup behind GET /api/products/{id}/related.
+
+    python bench/recommendations_bench.py --orders 1000000
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import percentile, prepare_workdir  # noqa: E402
+
+CHUNK = 50_000
+
+def load_orders(engine, models, rng, count, products):
+    weights = [1 / (rank + 1) for rank in range(products)]
+    ids = list(range(1, products + 1))
+    with engine.begin() as conn:
+        for start in range(0, count, CHUNK):
+            rows = []
+            for _ in range(min(CHUNK, count - start)):
+                basket = set(rng.choices(ids, weights, k=rng.randint(1, 5)))
+                # Products bought as sets: bed + its matching side table, etc.
+                for product_id in list(basket):
+                    if rng.random() < 0.3:
+                        basket.add(product_id % products + 1)
+                rows.append({
+                    "customer_name": "Bench Customer",
+                    "customer_phone": "01700000000",
+                    "total_amount": 1000.0,
+                    "items": json.dumps([{"id": p, "name": f"Product {p}", "quantity": 1, "price": 1000.0} for p in basket]),
+                    "status": "cancelled" if rng.random() < 0.05 else "completed",
+                })
+            conn.execute(models.Order.__table__.insert(), rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--new-orders", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", help="Directory for the benchmark database (default: temp dir)")
+    args = parser.parse_args()
+
+    prepare_workdir(args.workdir)
+    import models
+    import recommendations
+    from database import SessionLocal, engine
+
+    models.Base.metadata.create_all(bind=engine)
+    rng = random.Random(args.seed)
+    with engine.begin() as conn:
+        conn.execute(models.Product.__table__.insert(), [
+            {"nameEn": f"Product {i}", "nameBn": f"পণ্য {i}", "price": 1000.0, "category": "bed",
+             "descriptionEn": "", "descriptionBn": "", "image": ""}
+            for i in range(1, args.products + 1)
+        ])
+
+    start = time.perf_counter()
+    load_orders(engine, models, rng, args.orders, args.products)
+    print(f"loaded {args.orders} orders in {time.perf_counter() - start:.1f}s")
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        pairs = recommendations.rebuild(db)
+        elapsed = time.perf_counter() - start
+        print(f"full build:   {elapsed:.1f}s ({args.orders / elapsed:,.0f} orders/s), {pairs} product pairs")
+
+        load_orders(engine, models, rng, args.new_orders, args.products)
+        start = time.perf_counter()
+        counted = recommendations.refresh(db)
+        print(f"incremental:  {time.perf_counter() - start:.2f}s for {counted} new orders")
+
+        latencies = []
+        for _ in range(args.lookups):
+            product_id = rng.randint(1, args.products)
+            start = time.perf_counter()
+            recommendations.related_products(db, product_id, 6)
+            latencies.append((time.perf_counter() - start) * 1000)
+            db.expunge_all()
+        print(f"related lookup p50 {statistics.median(latencies):.3f} ms  p99 {percentile(latencies, 99):.3f} ms")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Run the load-test scenarios and write throughput/latency results as JSON.
+
+In-process (default): seeds a fresh SQLite database (or uses --database) and
+drives the FastAPI app through TestClient.
+
+    python bench/run.py --duration 10 --concurrency 4 --output results.json
+
+Against a running server (seed its database with bench/seed.py first and
+start it with RATE_LIMITS_ENABLED=0, since all load comes from one IP):
+
+    python bench/run.py --url http://127.0.0.1:8000 --output results.json
+
+Compare two runs with bench/compare.py.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import git_revision, prepare_workdir, summarize  # noqa: E402
+
+USER_PASSWORD = "password123"
+
+def login(client, username, password):
+    response = client.post("/api/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def catalog_browse(client, ctx, rng):
+    return [client.get("/api/products")]
+
+def product_page(client, ctx, rng):
+    product_id = rng.choice(ctx["product_ids"])
+    return [
+        client.get(f"/api/products/{product_id}"),
+        client.get(f"/api/products/{product_id}/reviews"),
+        client.get(f"/api/products/{product_id}/rating"),
+    ]
+
+def checkout(client, ctx, rng):
+    product = rng.choice(ctx["products"])
+    quantity = rng.randint(1, 3)
+    items = [{"id": product["id"], "name": product["nameEn"], "price": product["price"], "quantity": quantity}]
+    order = {
+        "customer_name": "Bench Customer",
+        "customer_phone": f"01{rng.randint(300000000, 999999999)}",
+        "customer_address": "Bench Road, Dhaka",
+        "total_amount": product["price"] * quantity,
+        "items": json.dumps(items),
+    }
+    return [client.post("/api/orders", json=order, headers=ctx["user_headers"])]
+
+def login_scenario(client, ctx, rng):
+    username = f"user{rng.randint(1, ctx['user_count'])}"
+    return [client.post("/api/auth/login", data={"username": username, "password": USER_PASSWORD})]
+
+def admin_dashboard(client, ctx, rng):
+    return [
+        client.get("/api/stats", headers=ctx["admin_headers"]),
+        client.get("/api/orders", headers=ctx["admin_headers"]),
+    ]
+
+SCENARIOS = {
+    "catalog_browse": catalog_browse,
+    "product_page": product_page,
+    "checkout": checkout,
+    "login": login_scenario,
+    "admin_dashboard": admin_dashboard,
+}
+
+def run_scenario(client, ctx, scenario, duration, concurrency, seed):
+    deadline = time.perf_counter() + duration
+    lock = threading.Lock()
+    latencies = []
+    errors = 0
+
+    def worker(worker_id):
+        nonlocal errors
+        rng = random.Random(seed * 1000 + worker_id)
+        local_latencies = []
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                responses = scenario(client, ctx, rng)
+                ok = all(response.status_code < 400 for response in responses)
+            except Exception:
+                ok = False
+            local_latencies.append((time.perf_counter() - start) * 1000)
+            local_errors += 0 if ok else 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors += local_errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+def build_context(client, user_count):
+    products = client.get("/api/products").json()
+    if not products:
+        raise SystemExit("No products found - seed the database with bench/seed.py first")
+    return {
+        "products": products,
+        "product_ids": [product["id"] for product in products],
+        "user_count": user_count,
+        "user_headers": login(client, "user1", USER_PASSWORD),
+        "admin_headers": login(client, "admin", "admin123"),
+    }
+
+def run_all(client, args):
+    ctx = build_context(client, args.users)
+    results = {}
+    for name in args.scenarios:
+        results[name] = run_scenario(client, ctx, SCENARIOS[name], args.duration, args.concurrency, args.seed)
+        print(f"{name:16} {results[name]['throughput_rps']:9.1f} req/s  "
+              f"p50 {results[name]['p50_ms']:8.2f} ms  p95 {results[name]['p95_ms']:8.2f} ms  "
+              f"p99 {results[name]['p99_ms']:8.2f} ms  errors {results[name]['errors']}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--database", help="Existing seeded SQLite file for in-process runs")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--users", type=int, default=500, help="Seeded user count (user1..userN)")
+    parser.add_argument("--products", type=int, default=300)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--rate-limits", action="store_true",
+                        help="Keep login/checkout rate limits on for in-process runs")
+    args = parser.parse_args()
+    output = Path(args.output).resolve()
+
+    if args.url:
+        import httpx
+        with httpx.Client(base_url=args.url, timeout=30) as client:
+            results = run_all(client, args)
+    else:
+        prepare_workdir(database=args.database)
+        # Every in-process request comes from one client address, so the per-IP
+        # limits would turn most login/checkout iterations into 429s
+        if not args.rate_limits:
+            os.environ.setdefault("RATE_LIMITS_ENABLED", "0")
+        from fastapi.testclient import TestClient
+        import main as server_main
+        if not args.database:
+            import seed
+            from database import SessionLocal
+            db = SessionLocal()
+            try:
+                seed.generate(db, random.Random(args.seed), args.users, args.products, args.orders, args.reviews)
+            finally:
+                db.close()
+        with TestClient(server_main.app) as client:
+            results = run_all(client, args)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "target": args.url or "in-process",
+        "config": {
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "dataset": None if args.url or args.database else {
+                "users": args.users, "products": args.products, "orders": args.orders, "reviews": args.reviews,
+            },
+        },
+        "scenarios": results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
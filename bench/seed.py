@@ -0,0 +1,151 @@
+"""Generate a synthetic dataset for benchmarks.
+
+Creates users, products (Bangla/English text), orders and reviews directly
+through `models`, deterministically for a given --seed.
+
+    python bench/seed.py --database /tmp/bench.db --users 1000 --products 500 \\
+        --orders 50000 --reviews 20000
+
+Every generated user has the password "password123"; the app's startup hook
+provides admin/admin123.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import prepare_workdir  # noqa: E402
+
+CATEGORIES = ["bed", "sofa", "cupboard", "door", "dining"]
+CATEGORY_NAMES = {
+    "bed": ("Bed", "খাট"),
+    "sofa": ("Sofa", "সোফা"),
+    "cupboard": ("Cupboard", "আলমারি"),
+    "door": ("Door", "দরজা"),
+    "dining": ("Dining Table", "ডাইনিং টেবিল"),
+}
+ADJECTIVES = [
+    ("Classic", "ক্লাসিক"), ("Modern", "আধুনিক"), ("Royal", "রাজকীয়"), ("Teak", "সেগুন"),
+    ("Carved", "খোদাই করা"), ("Compact", "ছোট"), ("Rustic", "গ্রামীণ"), ("Luxury", "বিলাসবহুল"),
+]
+DESCRIPTIONS = [
+    ("Handcrafted from seasoned hardwood with a natural finish.",
+     "প্রাকৃতিক ফিনিশসহ শুকনো শক্ত কাঠ দিয়ে হাতে তৈরি।"),
+    ("Solid construction built to last for generations.",
+     "প্রজন্মের পর প্রজন্ম টিকে থাকার মতো মজবুত গঠন।"),
+    ("Elegant design that fits any modern home.",
+     "যেকোনো আধুনিক বাড়ির জন্য মানানসই মার্জিত নকশা।"),
+]
+COMMENTS = [
+    "Excellent quality, highly recommended!", "Good value for money.", "Delivery was quick.",
+    "খুব সুন্দর কাজ।", "দাম অনুযায়ী ভালো।", None,
+]
+STATUSES = ["pending", "processing", "completed", "completed", "completed", "cancelled"]
+PASSWORD = "password123"
+BATCH = 5000
+
+def generate(db, rng, users, products, orders, reviews, days=365):
+    import models
+    from auth import get_password_hash
+
+    # One bcrypt hash shared by every synthetic user keeps seeding fast
+    hashed = get_password_hash(PASSWORD)
+    db.bulk_insert_mappings(models.User, [
+        {"username": f"user{i}", "hashed_password": hashed, "is_admin": False}
+        for i in range(1, users + 1)
+    ])
+    db.commit()
+    user_ids = [row.id for row in db.query(models.User.id).filter(models.User.username.like("user%"))]
+
+    product_rows = []
+    for i in range(1, products + 1):
+        category = rng.choice(CATEGORIES)
+        adjective = rng.choice(ADJECTIVES)
+        noun = CATEGORY_NAMES[category]
+        description = rng.choice(DESCRIPTIONS)
+        product_rows.append({
+            "nameEn": f"{adjective[0]} {noun[0]} {i}",
+            "nameBn": f"{adjective[1]} {noun[1]} {i}",
+            "price": round(rng.uniform(5000, 150000), -2),
+            "descriptionEn": description[0],
+            "descriptionBn": description[1],
+            "image": "/static/uploads/placeholder.png",
+            "category": category,
+        })
+    db.bulk_insert_mappings(models.Product, product_rows)
+    db.commit()
+    catalog = db.query(models.Product.id, models.Product.nameEn, models.Product.price).all()
+
+    now = datetime.utcnow()
+    for start in range(0, orders, BATCH):
+        rows = []
+        for _ in range(min(BATCH, orders - start)):
+            picked = rng.sample(catalog, k=min(len(catalog), rng.randint(1, 4)))
+            items = [{"id": p.id, "name": p.nameEn, "price": p.price, "quantity": rng.randint(1, 3)} for p in picked]
+            user_id = rng.choice(user_ids) if user_ids and rng.random() < 0.8 else None
+            rows.append({
+                "user_id": user_id,
+                "customer_name": f"Customer {rng.randint(1, 100000)}",
+                "customer_phone": f"01{rng.randint(300000000, 999999999)}",
+                "customer_address": f"House {rng.randint(1, 200)}, Road {rng.randint(1, 50)}, Dhaka",
+                "total_amount": sum(item["price"] * item["quantity"] for item in items),
+                "items": json.dumps(items),
+                "status": rng.choice(STATUSES),
+                "created_at": now - timedelta(seconds=rng.randint(0, days * 86400)),
+            })
+        db.bulk_insert_mappings(models.Order, rows)
+        db.commit()
+
+    # At most one review per (product, user), matching create_review's rule
+    seen = set()
+    rows = []
+    attempts = 0
+    while len(rows) < reviews and user_ids and attempts < reviews * 5:
+        attempts += 1
+        key = (rng.choice(catalog).id, rng.choice(user_ids))
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append({
+            "product_id": key[0],
+            "user_id": key[1],
+            "rating": rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 6, 9])[0],
+            "comment": rng.choice(COMMENTS),
+            "is_approved": rng.random() < 0.9,
+            "created_at": now - timedelta(seconds=rng.randint(0, days * 86400)),
+        })
+    for start in range(0, len(rows), BATCH):
+        db.bulk_insert_mappings(models.Review, rows[start:start + BATCH])
+        db.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", help="SQLite file to create (default: bench.db in the workdir)")
+    parser.add_argument("--workdir", help="Directory to run in (default: new temp dir)")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--products", type=int, default=300)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--reviews", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    workdir = prepare_workdir(args.workdir, args.database)
+    import models
+    from database import SessionLocal, engine, SQLALCHEMY_DATABASE_URL
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        generate(db, random.Random(args.seed), args.users, args.products, args.orders, args.reviews)
+    finally:
+        db.close()
+    print(f"Seeded {SQLALCHEMY_DATABASE_URL} in {time.perf_counter() - start:.1f}s (workdir {workdir})")
+
+if __name__ == "__main__":
+    main()
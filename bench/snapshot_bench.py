@@ -0,0 +1,82 @@
+"""Storefront catalog load: GET /api/products vs the prebuilt static snapshot.
+
+Publishes a snapshot of --products products, then times the API and the
+snapshot file (through the app's /static mount; nginx would serve it without
+touching Python at all) and reports body size, with and without the .gz.
+
+    python bench/snapshot_bench.py --products 20000 --requests 30
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import percentile, prepare_workdir  # noqa: E402
+
+WORDS_EN = "solid teak oak walnut hand polished finish drawer storage comfortable modern classic".split()
+WORDS_BN = "সেগুন কাঠ মজবুত আধুনিক ক্লাসিক ড্রয়ার আরামদায়ক পালিশ নকশা টেকসই".split()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    os.environ.setdefault("RATE_LIMITS_ENABLED", "0")
+    from fastapi.testclient import TestClient
+    import main as server_main
+    import models
+    import snapshots
+    from database import engine, SessionLocal
+
+    rng = random.Random(args.seed)
+    with engine.begin() as conn:
+        conn.execute(models.Product.__table__.insert(), [
+            {
+                "nameEn": f"{rng.choice(WORDS_EN).title()} Bed {i}",
+                "nameBn": f"{rng.choice(WORDS_BN)} খাট {i}",
+                "descriptionEn": " ".join(rng.choices(WORDS_EN, k=40)),
+                "descriptionBn": " ".join(rng.choices(WORDS_BN, k=40)),
+                "price": float(rng.randint(5, 200) * 1000),
+                "category": rng.choice(["bed", "sofa", "cupboard", "door", "dining"]),
+                "image": f"/static/uploads/{i:08d}.jpg",
+            }
+            for i in range(args.products)
+        ])
+
+    db = SessionLocal()
+    start = time.perf_counter()
+    manifest = snapshots.publish(db)
+    publish_ms = (time.perf_counter() - start) * 1000
+    db.close()
+
+    variants = [
+        ("GET /api/products?lang=en", "/api/products?lang=en"),
+        ("snapshot products.en.json", manifest["catalogs"]["en"]["products"]),
+        ("snapshot category-bed.en.json", manifest["catalogs"]["en"]["categories"]["bed"]),
+    ]
+    print(f"{args.products} products, snapshot published in {publish_ms:,.0f} ms, {args.requests} requests per variant")
+    print(f"{'variant':<32} {'bytes':>12} {'gzip bytes':>12} {'p50 ms':>9} {'p99 ms':>9}")
+    with TestClient(server_main.app) as client:
+        for label, url in variants:
+            latencies = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                response = client.get(url)
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+            size = len(response.content)
+            gz = Path(url.replace("/static/", "static/", 1) + ".gz")
+            gz_size = f"{gz.stat().st_size:,}" if gz.exists() else "-"
+            print(f"{label:<32} {size:>12,} {gz_size:>12} "
+                  f"{statistics.median(latencies):>9.1f} {percentile(latencies, 99):>9.1f}")
+
+if __name__ == "__main__":
+    main()
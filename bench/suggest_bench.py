@@ -0,0 +1,72 @@
+"""Benchmark for the product-name typeahead index.
+
+Reports p50/p99 suggestion latency and index memory per 10k products.
+
+    python bench/suggest_bench.py --products 10000 --queries 20000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import percentile, use_server_modules  # noqa: E402
+
+use_server_modules()
+
+from search_index import PrefixIndex  # noqa: E402
+
+ADJECTIVES = ["Wooden", "Modern", "Classic", "Royal", "Teak", "Oak", "Rustic", "Carved", "Compact", "Luxury"]
+NOUNS = ["Bed", "Sofa", "Cupboard", "Door", "Dining Table", "Wardrobe", "Chair", "Shelf", "Cabinet", "Desk"]
+BN_WORDS = ["কাঠের", "আধুনিক", "রাজকীয়", "খাট", "সোফা", "আলমারি", "দরজা", "ডাইনিং", "টেবিল", "চেয়ার"]
+
+def make_products(count: int, rng: random.Random):
+    products = []
+    for i in range(1, count + 1):
+        name_en = f"{rng.choice(ADJECTIVES)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {i}"
+        name_bn = " ".join(rng.choice(BN_WORDS) for _ in range(3)) + f" {i}"
+        products.append(SimpleNamespace(id=i, nameEn=name_en, nameBn=name_bn))
+    return products
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    products = make_products(args.products, rng)
+
+    tracemalloc.start()
+    index = PrefixIndex()
+    start = time.perf_counter()
+    index.build(products)
+    build_s = time.perf_counter() - start
+    index_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    words_en = [w.lower() for w in ADJECTIVES + NOUNS]
+    latencies = []
+    for _ in range(args.queries):
+        lang = rng.choice(("en", "bn"))
+        word = rng.choice(words_en if lang == "en" else BN_WORDS)
+        prefix = word[: rng.randint(1, len(word))]
+        start = time.perf_counter()
+        index.suggest(prefix, lang=lang, limit=8)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    print(f"products:            {args.products}")
+    print(f"build time:          {build_s * 1000:.1f} ms")
+    print(f"index memory:        {index_bytes / 1024 / 1024:.2f} MiB "
+          f"({index_bytes / 1024 / 1024 * 10000 / args.products:.2f} MiB per 10k products)")
+    print(f"suggest p50:         {statistics.median(latencies):.4f} ms")
+    print(f"suggest p99:         {percentile(latencies, 99):.4f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Product view counting: write-behind counters vs one UPDATE per view.
+
+1. Read path: GET /api/products/{id} with view_counter.record() vs with it
+   replaced by a no-op, plus the cost of record() itself across threads.
+2. Write path: --rate views/s (Zipf-ish over --products) for --seconds,
+   flushed every view_counts.FLUSH_INTERVAL_SECONDS, vs committing an
+   UPDATE product_stats per view.
+
+    python bench/views_bench.py --products 5000 --rate 5000 --seconds 10
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import percentile, prepare_workdir  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--rate", type=int, default=5000, help="Views per second")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    os.environ.setdefault("RATE_LIMITS_ENABLED", "0")
+    from fastapi.testclient import TestClient
+    from sqlalchemy import update
+    import main as server_main
+    import models
+    import view_counts
+    from database import engine, SessionLocal
+
+    with engine.begin() as conn:
+        conn.execute(models.Product.__table__.insert(), [
+            {"nameEn": f"Product {i}", "nameBn": f"পণ্য {i}", "price": 1000.0, "category": "bed", "image": ""}
+            for i in range(args.products)
+        ])
+
+    rng = random.Random(args.seed)
+    weights = [1 / (rank + 1) for rank in range(args.products)]
+    def sample(n):
+        return rng.choices(range(1, args.products + 1), weights=weights, k=n)
+
+    counter = view_counts.view_counter
+    # 1. Read path
+    print(f"GET /api/products/{{id}}, {args.requests} requests")
+    with TestClient(server_main.app) as client:
+        record = counter.record
+        for label, recorder in (("no counting", lambda product_id: None), ("write-behind record()", record)):
+            counter.record = recorder
+            latencies = []
+            for product_id in sample(args.requests):
+                start = time.perf_counter()
+                client.get(f"/api/products/{product_id}").raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+            print(f"  {label:<24} p50 {statistics.median(latencies):6.3f} ms  p99 {percentile(latencies, 99):6.3f} ms")
+        counter.record = record
+    counter.stop()
+
+    ids = sample(200_000)
+    per_thread = len(ids) // args.threads
+    def hammer(chunk):
+        for product_id in chunk:
+            counter.record(product_id)
+    threads = [threading.Thread(target=hammer, args=(ids[i * per_thread:(i + 1) * per_thread],)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    print(f"  record() from {args.threads} threads: {elapsed / len(ids) * 1e6:.2f} us/call, "
+          f"{len(ids) / elapsed:,.0f} calls/s")
+    counter.flush()
+
+    # 2. Write path at --rate views/s
+    total = int(args.rate * args.seconds)
+    interval = view_counts.FLUSH_INTERVAL_SECONDS
+    per_flush = int(args.rate * interval)
+    print(f"\n{total:,} views at {args.rate:,}/s, flushed every {interval:g}s ({per_flush:,} views per flush)")
+    flush_ms, rows = [], []
+    views = sample(total)
+    for offset in range(0, total, per_flush):
+        for product_id in views[offset:offset + per_flush]:
+            counter.record(product_id)
+        start = time.perf_counter()
+        rows.append(counter.flush())
+        flush_ms.append((time.perf_counter() - start) * 1000)
+    busy = sum(flush_ms) / 1000 / args.seconds
+    print(f"  write-behind: {len(flush_ms)} flushes, {statistics.mean(rows):,.0f} rows each, "
+          f"p50 {statistics.median(flush_ms):.1f} ms, max {max(flush_ms):.1f} ms, DB busy {busy:.2%} of wall time")
+
+    table = models.ProductStats.__table__
+    sample_size = min(total, 5000)
+    db = SessionLocal()
+    start = time.perf_counter()
+    for product_id in views[:sample_size]:
+        db.execute(update(table).where(table.c.product_id == product_id).values(views=table.c.views + 1))
+        db.commit()
+    per_view = (time.perf_counter() - start) / sample_size
+    db.close()
+    print(f"  UPDATE per view: {per_view * 1000:.3f} ms each -> DB busy {per_view * args.rate:.0%} of wall time at {args.rate:,}/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Measure req/s scaling of server/serve.py from 1 to N workers on GET /api/products.
+
+Seeds a scratch database once, then for each worker count starts the launcher,
+drives it from --clients load-generator processes for --duration seconds and
+shuts it down with SIGTERM.
+
+    python bench/workers_bench.py --max-workers 4 --clients 8 --duration 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from common import SERVER_DIR, percentile, prepare_workdir  # noqa: E402
+
+def client_process(url, duration, queue):
+    import httpx
+    latencies = []
+    deadline = time.perf_counter() + duration
+    with httpx.Client(base_url=url, timeout=30) as client:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            client.get("/api/products")
+            latencies.append((time.perf_counter() - start) * 1000)
+    queue.put(latencies)
+
+def wait_until_ready(url, timeout=30):
+    import httpx
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+def measure(workers, args):
+    url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, str(SERVER_DIR / "serve.py"), "--workers", str(workers), "--port", str(args.port),
+         "--log-level", "warning"],
+        env={**os.environ, "METRICS_ENABLED": os.getenv("METRICS_ENABLED", "1")},
+    )
+    try:
+        wait_until_ready(url)
+        queue = multiprocessing.Queue()
+        clients = [multiprocessing.Process(target=client_process, args=(url, args.duration, queue))
+                   for _ in range(args.clients)]
+        for client in clients:
+            client.start()
+        latencies = []
+        for _ in clients:
+            latencies.extend(queue.get())
+        for client in clients:
+            client.join()
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return len(latencies) / args.duration, percentile(latencies, 50), percentile(latencies, 99)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--clients", type=int, default=8, help="Load-generator processes")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--products", type=int, default=300)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    prepare_workdir()
+    import models
+    import seed
+    from database import SessionLocal, engine
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        seed.generate(db, random.Random(42), users=10, products=args.products, orders=100, reviews=100)
+    finally:
+        db.close()
+    engine.dispose()
+
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        rps, p50, p99 = measure(workers, args)
+        baseline = baseline or rps
+        print(f"{workers:2} workers  {rps:9.1f} req/s  ({rps / baseline:4.2f}x)  p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
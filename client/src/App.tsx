@@ -21,6 +21,8 @@ import Login from "@/pages/login";
 import Register from "@/pages/register";
 import AdminDashboard from "@/pages/admin/dashboard";
 import AdminProducts from "@/pages/admin/products";
+import AdminOrders from "@/pages/admin/orders";
+import AdminReviews from "@/pages/admin/reviews";
 import Contact from "@/pages/contact";
 import About from "@/pages/about";
 
@@ -60,6 +62,16 @@ function Router() {
             <AdminProducts />
           </ProtectedRoute>
         </Route>
+        <Route path="/admin/orders">
+          <ProtectedRoute allowedRoles={['admin']}>
+            <AdminOrders />
+          </ProtectedRoute>
+        </Route>
+        <Route path="/admin/reviews">
+          <ProtectedRoute allowedRoles={['admin']}>
+            <AdminReviews />
+          </ProtectedRoute>
+        </Route>
 
         {/* 404 */}
         <Route component={NotFound} />
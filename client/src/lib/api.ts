@@ -12,6 +12,11 @@ export interface Product {
   category: 'bed' | 'sofa' | 'cupboard' | 'door' | 'dining';
 }
 
+export interface ProductBatch<P = Product> {
+  products: P[];
+  missing: number[];
+}
+
 export interface ProductCreateData {
   nameBn: string;
   nameEn: string;
@@ -60,6 +65,7 @@ export interface Order {
   items: string;
   status: string;
   created_at?: string;
+  archived_at?: string | null;
 }
 
 export interface OrderCreate {
@@ -91,6 +97,18 @@ export interface ReviewCreate {
   comment?: string;
 }
 
+export interface ReviewBulkAction {
+  action: 'approve' | 'reject' | 'delete';
+  ids?: number[];
+  product_id?: number;
+  is_approved?: boolean;
+  max_rating?: number;
+}
+
+export interface BulkResult {
+  affected: number;
+}
+
 export interface ProductRating {
   average_rating: number;
   review_count: number;
@@ -109,8 +127,31 @@ export interface UserInDB {
   is_admin: boolean;
 }
 
+// Sparse product responses: ?lang= drops the other language's name/description,
+// ?fields= limits the columns. Fields left out are simply absent from each object.
+export type SparseProduct = Partial<Product> & Pick<Product, 'id'>;
+export type ProductLang = 'en' | 'bn';
+export type ProductField = 'id' | 'name' | 'description' | 'price' | 'image' | 'category';
+
+export interface ProductQuery {
+  lang?: ProductLang;
+  fields?: ProductField[];
+  sort?: 'popular';
+}
+
+function productQuery(query?: ProductQuery): string {
+  const params = new URLSearchParams();
+  if (query?.lang) params.set("lang", query.lang);
+  if (query?.fields) params.set("fields", query.fields.join(","));
+  if (query?.sort) params.set("sort", query.sort);
+  const search = params.toString();
+  return search ? `?${search}` : "";
+}
+
 // API Helper for JSON requests
 const BASE_URL = "/api";
+// Orders per page of an order history that includes archived orders
+export const ORDER_PAGE_SIZE = 50;
 
 async function fetchJson<T>(endpoint: string, options?: RequestInit): Promise<T> {
   const token = localStorage.getItem("token");
@@ -156,11 +197,58 @@ async function fetchFormData<T>(endpoint: string, formData: FormData, method: st
   return res.json();
 }
 
+// Static catalog snapshot published by the server after product writes
+// (server/snapshots.py). The manifest is revalidated on every load; the
+// versioned files it points to never change, so the browser can cache them.
+interface CatalogManifest {
+  version: string;
+  catalogs: Record<string, { products: string; categories: Record<string, string> }>;
+}
+
+async function fetchCatalog(): Promise<Product[]>;
+async function fetchCatalog(lang: ProductLang): Promise<SparseProduct[]>;
+async function fetchCatalog(lang?: ProductLang): Promise<SparseProduct[]> {
+  try {
+    const manifestRes = await fetch("/static/catalog/manifest.json", { cache: "no-cache" });
+    if (!manifestRes.ok) throw new Error(manifestRes.statusText);
+    const manifest: CatalogManifest = await manifestRes.json();
+    const res = await fetch(manifest.catalogs[lang ?? "all"].products);
+    if (!res.ok) throw new Error(res.statusText);
+    return await res.json();
+  } catch {
+    // No snapshot published yet (or it was pruned mid-load): ask the API
+    return fetchJson<SparseProduct[]>(`/products${productQuery({ lang })}`);
+  }
+}
+
+// Without a query these return the full schema; with one, a SparseProduct
+function listProducts(): Promise<Product[]>;
+function listProducts(query: ProductQuery): Promise<SparseProduct[]>;
+function listProducts(query?: ProductQuery) {
+  return fetchJson<SparseProduct[]>(`/products${productQuery(query)}`);
+}
+
+function getProduct(id: number): Promise<Product>;
+function getProduct(id: number, query: ProductQuery): Promise<SparseProduct>;
+function getProduct(id: number, query?: ProductQuery) {
+  return fetchJson<SparseProduct>(`/products/${id}${productQuery(query)}`);
+}
+
+function batchProducts(ids: number[]): Promise<ProductBatch>;
+function batchProducts(ids: number[], query: ProductQuery): Promise<ProductBatch<SparseProduct>>;
+function batchProducts(ids: number[], query?: ProductQuery) {
+  const search = productQuery(query);
+  return fetchJson<ProductBatch<SparseProduct>>(`/products/batch${search ? `${search}&` : "?"}ids=${ids.join(",")}`);
+}
+
 // Product API
 export const api = {
   products: {
-    list: () => fetchJson<Product[]>("/products"),
-    get: (id: number) => fetchJson<Product>(`/products/${id}`),
+    list: listProducts,
+    catalog: fetchCatalog,
+    get: getProduct,
+    batch: batchProducts,
+    related: (id: number, limit: number = 4) => fetchJson<Product[]>(`/products/${id}/related?limit=${limit}`),
     create: (data: ProductCreateData) => {
       const formData = new FormData();
       formData.append("nameEn", data.nameEn);
@@ -217,16 +305,23 @@ export const api = {
     me: () => fetchJson<User>("/auth/me"),
   },
   orders: {
-    list: () => fetchJson<Order[]>("/orders"),
-    myOrders: () => fetchJson<Order[]>("/my-orders"),
-    create: (order: OrderCreate) => fetchJson<{ message: string; order_id: number }>("/orders", {
+    list: (includeArchived: boolean = false) => fetchJson<Order[]>(`/orders${includeArchived ? "?include_archived=true" : ""}`),
+    // With archived orders the server returns one page (newest first); pass offset for the next
+    myOrders: (includeArchived: boolean = false, offset: number = 0) =>
+      fetchJson<Order[]>(`/my-orders${includeArchived ? `?include_archived=true&limit=${ORDER_PAGE_SIZE}&offset=${offset}` : ""}`),
+    create: (order: OrderCreate, idempotencyKey?: string) => fetchJson<{ message: string; order_id: number }>("/orders", {
       method: "POST",
       body: JSON.stringify(order),
+      headers: idempotencyKey ? { "Idempotency-Key": idempotencyKey } : undefined,
     }),
     updateStatus: (id: number, data: OrderUpdate) => fetchJson<Order>(`/orders/${id}`, {
       method: "PUT",
       body: JSON.stringify(data),
     }),
+    bulkStatus: (ids: number[], status: string) => fetchJson<BulkResult>("/orders/bulk-status", {
+      method: "POST",
+      body: JSON.stringify({ ids, status }),
+    }),
     delete: (id: number) => fetchJson<{ message: string }>(`/orders/${id}`, {
       method: "DELETE",
     }),
@@ -246,6 +341,10 @@ export const api = {
     delete: (id: number) => fetchJson<{ message: string }>(`/admin/reviews/${id}`, {
       method: "DELETE",
     }),
+    bulk: (data: ReviewBulkAction) => fetchJson<BulkResult>("/admin/reviews/bulk", {
+      method: "POST",
+      body: JSON.stringify(data),
+    }),
   },
   stats: {
     get: () => fetchJson<DashboardStats>("/stats"),
@@ -1,6 +1,8 @@
-import { createContext, useContext, useState, ReactNode } from 'react';
+import { createContext, useContext, useState, useEffect, ReactNode } from 'react';
+import { useQuery } from '@tanstack/react-query';
 import { useToast } from '@/hooks/use-toast';
 import { useLanguage } from './language-context';
+import { api, SparseProduct } from './api';
 
 export interface Product {
   id: number;
@@ -23,6 +25,7 @@ interface CartContextType {
   removeFromCart: (productId: number) => void;
   updateQuantity: (productId: number, quantity: number) => void;
   clearCart: () => void;
+  syncProducts: (latest: SparseProduct[], missing: number[]) => void;
   cartTotal: number;
   cartCount: number;
 }
@@ -70,11 +73,23 @@ export function CartProvider({ children }: { children: ReactNode }) {
     setItems([]);
   };
 
+  // Apply current product details (price, name, ...) and drop products that no longer exist.
+  // The batch is localized, so fields it leaves out keep their cached value.
+  const syncProducts = (latest: SparseProduct[], missing: number[]) => {
+    const byId = new Map(latest.map(p => [p.id, p] as const));
+    const gone = new Set(missing);
+    setItems(current =>
+      current
+        .filter(item => !gone.has(item.id))
+        .map(item => byId.has(item.id) ? { ...item, ...byId.get(item.id), quantity: item.quantity } : item)
+    );
+  };
+
   const cartTotal = items.reduce((total, item) => total + (item.price * item.quantity), 0);
   const cartCount = items.reduce((count, item) => count + item.quantity, 0);
 
   return (
-    <CartContext.Provider value={{ items, addToCart, removeFromCart, updateQuantity, clearCart, cartTotal, cartCount }}>
+    <CartContext.Provider value={{ items, addToCart, removeFromCart, updateQuantity, clearCart, syncProducts, cartTotal, cartCount }}>
       {children}
     </CartContext.Provider>
   );
@@ -85,3 +100,29 @@ export function useCart() {
   if (!context) throw new Error('useCart must be used within a CartProvider');
   return context;
 }
+
+// Re-reads every product in the cart with one /api/products/batch request so
+// the cart and checkout show current prices
+export function useFreshCart() {
+  const { items, syncProducts } = useCart();
+  const { language } = useLanguage();
+  const { toast } = useToast();
+  const ids = items.map(item => item.id).sort((a, b) => a - b);
+
+  const { data } = useQuery({
+    queryKey: ['products', 'batch', ids, language],
+    queryFn: () => api.products.batch(ids, { lang: language }),
+    enabled: ids.length > 0,
+  });
+
+  useEffect(() => {
+    if (!data) return;
+    syncProducts(data.products, data.missing);
+    if (data.missing.length > 0) {
+      toast({
+        title: "Cart updated",
+        description: "Some products are no longer available and were removed from your cart.",
+      });
+    }
+  }, [data]);
+}
@@ -52,6 +52,7 @@ export const translations: Translations = {
   dashboard: 'Dashboard',
   manageProducts: 'Manage Products',
   manageOrders: 'Manage Orders',
+  moderateReviews: 'Moderate Reviews',
   addProduct: 'Add New Product',
   productName: 'Product Name',
   productPrice: 'Product Price',
@@ -0,0 +1,88 @@
+import { useEffect } from "react";
+import { QueryClient, useQueryClient } from "@tanstack/react-query";
+import type { Order } from "./api";
+
+// Patches the ['orders'] query cache from the admin SSE feed at /api/orders/stream
+// instead of refetching the whole order list. Uses fetch rather than EventSource
+// so the Authorization header can be sent.
+
+function applyEvent(queryClient: QueryClient, type: string, data: any) {
+  if (type === "reset") {
+    queryClient.invalidateQueries({ queryKey: ['orders'] });
+    return;
+  }
+  queryClient.setQueryData<Order[]>(['orders'], (orders) => {
+    if (!orders) return orders;
+    switch (type) {
+      case "order_created":
+        return orders.some(o => o.id === data.id) ? orders : [data as Order, ...orders];
+      case "order_updated":
+        return orders.map(o => o.id === data.id ? (data as Order) : o);
+      case "order_deleted":
+        return orders.filter(o => o.id !== data.id);
+      default:
+        return orders;
+    }
+  });
+  queryClient.invalidateQueries({ queryKey: ['stats'] });
+}
+
+export function useOrderStream(enabled: boolean = true) {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!enabled) return;
+    const controller = new AbortController();
+    let lastEventId: string | null = null;
+    let retryMs = 3000;
+
+    const connect = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const token = localStorage.getItem("token");
+          const res = await fetch("/api/orders/stream", {
+            headers: {
+              ...(token ? { "Authorization": `Bearer ${token}` } : {}),
+              ...(lastEventId ? { "Last-Event-ID": lastEventId } : {}),
+            },
+            signal: controller.signal,
+          });
+          if (!res.ok || !res.body) {
+            if (res.status === 401 || res.status === 403) return;
+            throw new Error(`Order stream failed: ${res.status}`);
+          }
+
+          const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+          let buffer = "";
+          while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+            let boundary;
+            while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+              const frame = buffer.slice(0, boundary);
+              buffer = buffer.slice(boundary + 2);
+              let id: string | null = null;
+              let type = "message";
+              let data = "";
+              for (const line of frame.split("\n")) {
+                if (line.startsWith("id: ")) id = line.slice(4);
+                else if (line.startsWith("event: ")) type = line.slice(7);
+                else if (line.startsWith("data: ")) data += line.slice(6);
+                else if (line.startsWith("retry: ")) retryMs = Number(line.slice(7)) || retryMs;
+              }
+              if (id) lastEventId = id;
+              if (data) applyEvent(queryClient, type, JSON.parse(data));
+            }
+          }
+        } catch (error) {
+          if (controller.signal.aborted) return;
+        }
+        await new Promise(resolve => setTimeout(resolve, retryMs));
+      }
+    };
+
+    connect();
+    return () => controller.abort();
+  }, [enabled, queryClient]);
+}
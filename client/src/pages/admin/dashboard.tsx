@@ -35,7 +35,7 @@ export default function AdminDashboard() {
 
   const { data: orders, isLoading: ordersLoading, error: ordersError } = useQuery({
     queryKey: ['orders'],
-    queryFn: api.orders.list,
+    queryFn: () => api.orders.list(),
     retry: false
   });
 
@@ -77,6 +77,12 @@ export default function AdminDashboard() {
           <Link href="/admin/products">
             <Button variant="outline">{t('manageProducts')}</Button>
           </Link>
+          <Link href="/admin/orders">
+            <Button variant="outline">{t('manageOrders')}</Button>
+          </Link>
+          <Link href="/admin/reviews">
+            <Button variant="outline">{t('moderateReviews')}</Button>
+          </Link>
         </div>
       </div>
 
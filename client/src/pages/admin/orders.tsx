@@ -1,10 +1,12 @@
 import { useState } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-import { api } from "@/lib/api";
+import { api, Order } from "@/lib/api";
+import { useOrderStream } from "@/lib/order-stream";
 import { Card, CardContent } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { Badge } from "@/components/ui/badge";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
+import { Checkbox } from "@/components/ui/checkbox";
 import { Trash2, Package, ArrowLeft, AlertCircle } from "lucide-react";
 import { Link } from "wouter";
 import { useToast } from "@/hooks/use-toast";
@@ -14,18 +16,25 @@ export default function AdminOrders() {
   const { toast } = useToast();
   const queryClient = useQueryClient();
   const [selectedStatus, setSelectedStatus] = useState<string>("all");
+  const [selectedIds, setSelectedIds] = useState<Set<number>>(new Set());
+  const [bulkStatus, setBulkStatus] = useState<string>("processing");
 
   const { data: orders, isLoading, error } = useQuery({
     queryKey: ['orders'],
-    queryFn: api.orders.list,
+    queryFn: () => api.orders.list(),
     retry: false
   });
 
+  // Live updates: new orders and status changes are patched into the cache
+  useOrderStream();
+
   const updateMutation = useMutation({
     mutationFn: ({ id, status }: { id: number; status: string }) => 
       api.orders.updateStatus(id, { status }),
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['orders'] });
+    onSuccess: (updated) => {
+      queryClient.setQueryData<Order[]>(['orders'], (current) =>
+        current?.map(o => o.id === updated.id ? updated : o)
+      );
       toast({ title: "Order status updated successfully" });
     },
     onError: (error: Error) => {
@@ -37,10 +46,34 @@ export default function AdminOrders() {
     }
   });
 
+  // One request (a single UPDATE on the server) for all selected orders
+  const bulkMutation = useMutation({
+    mutationFn: ({ ids, status }: { ids: number[]; status: string }) =>
+      api.orders.bulkStatus(ids, status),
+    onSuccess: (result, { ids, status }) => {
+      const updated = new Set(ids);
+      queryClient.setQueryData<Order[]>(['orders'], (current) =>
+        current?.map(o => updated.has(o.id) ? { ...o, status } : o)
+      );
+      queryClient.invalidateQueries({ queryKey: ['stats'] });
+      setSelectedIds(new Set());
+      toast({ title: `${result.affected} order(s) updated` });
+    },
+    onError: (error: Error) => {
+      toast({
+        title: "Failed to update orders",
+        description: error.message,
+        variant: "destructive"
+      });
+    }
+  });
+
   const deleteMutation = useMutation({
     mutationFn: api.orders.delete,
-    onSuccess: () => {
-      queryClient.invalidateQueries({ queryKey: ['orders'] });
+    onSuccess: (_, id) => {
+      queryClient.setQueryData<Order[]>(['orders'], (current) =>
+        current?.filter(o => o.id !== id)
+      );
       toast({ title: "Order deleted successfully" });
     },
     onError: (error: Error) => {
@@ -66,6 +99,20 @@ export default function AdminOrders() {
     selectedStatus === "all" || order.status === selectedStatus
   ) || [];
 
+  const allSelected = filteredOrders.length > 0 && filteredOrders.every(o => selectedIds.has(o.id));
+
+  const toggleSelected = (id: number, checked: boolean) => {
+    setSelectedIds(current => {
+      const next = new Set(current);
+      if (checked) next.add(id); else next.delete(id);
+      return next;
+    });
+  };
+
+  const toggleAll = (checked: boolean) => {
+    setSelectedIds(checked ? new Set(filteredOrders.map(o => o.id)) : new Set());
+  };
+
   if (isLoading) {
     return <div className="container mx-auto px-4 py-16 text-center">Loading orders...</div>;
   }
@@ -111,6 +158,34 @@ export default function AdminOrders() {
         </span>
       </div>
 
+      {/* Bulk actions */}
+      <div className="mb-6 flex flex-wrap gap-2 items-center">
+        <Checkbox
+          checked={allSelected}
+          onCheckedChange={(checked) => toggleAll(checked === true)}
+          aria-label="Select all orders"
+        />
+        <span className="text-sm font-medium">{selectedIds.size} selected</span>
+        <Select value={bulkStatus} onValueChange={setBulkStatus}>
+          <SelectTrigger className="w-[180px]">
+            <SelectValue />
+          </SelectTrigger>
+          <SelectContent>
+            <SelectItem value="pending">Pending</SelectItem>
+            <SelectItem value="processing">Processing</SelectItem>
+            <SelectItem value="completed">Completed</SelectItem>
+            <SelectItem value="cancelled">Cancelled</SelectItem>
+          </SelectContent>
+        </Select>
+        <Button
+          size="sm"
+          disabled={selectedIds.size === 0 || bulkMutation.isPending}
+          onClick={() => bulkMutation.mutate({ ids: Array.from(selectedIds), status: bulkStatus })}
+        >
+          Set status
+        </Button>
+      </div>
+
       {/* Orders List */}
       <div className="space-y-4">
         {filteredOrders.length === 0 ? (
@@ -129,7 +204,14 @@ export default function AdminOrders() {
                   {/* Header */}
                   <div className="flex flex-col lg:flex-row justify-between gap-4 mb-4 pb-4 border-b">
                     <div className="space-y-1">
-                      <p className="font-bold text-lg">Order #{order.id}</p>
+                      <div className="flex items-center gap-3">
+                        <Checkbox
+                          checked={selectedIds.has(order.id)}
+                          onCheckedChange={(checked) => toggleSelected(order.id, checked === true)}
+                          aria-label={`Select order ${order.id}`}
+                        />
+                        <p className="font-bold text-lg">Order #{order.id}</p>
+                      </div>
                       <p className="text-sm text-muted-foreground">
                         {order.created_at && format(new Date(order.created_at), 'MMM dd, yyyy HH:mm')}
                       </p>
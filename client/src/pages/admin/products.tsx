@@ -47,7 +47,7 @@ export default function AdminProducts() {
   // API Hooks
   const { data: products, isLoading, error } = useQuery({
     queryKey: ['products'],
-    queryFn: api.products.list,
+    queryFn: () => api.products.list(),
     retry: false
   });
 
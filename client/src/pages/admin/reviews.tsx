@@ -0,0 +1,195 @@
+import { useState } from "react";
+import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { api, Review, ReviewBulkAction } from "@/lib/api";
+import { Card, CardContent } from "@/components/ui/card";
+import { Button } from "@/components/ui/button";
+import { Badge } from "@/components/ui/badge";
+import { Checkbox } from "@/components/ui/checkbox";
+import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
+import { MessageSquare, ArrowLeft, AlertCircle, Check, X, Trash2, Star } from "lucide-react";
+import { Link } from "wouter";
+import { useToast } from "@/hooks/use-toast";
+import { format } from "date-fns";
+
+export default function AdminReviews() {
+  const { toast } = useToast();
+  const queryClient = useQueryClient();
+  const [filter, setFilter] = useState<string>("all");
+  const [selectedIds, setSelectedIds] = useState<Set<number>>(new Set());
+
+  const { data: reviews, isLoading, error } = useQuery({
+    queryKey: ['admin-reviews'],
+    queryFn: api.reviews.list,
+    retry: false
+  });
+
+  const { data: products } = useQuery({
+    queryKey: ['products', 'names'],
+    queryFn: () => api.products.list({ lang: 'en', fields: ['id', 'name'] }),
+  });
+  const productNames = new Map<number, string>(products?.map(p => [p.id, p.nameEn ?? '']) ?? []);
+
+  // Every action is one request, run on the server as a single UPDATE/DELETE
+  const bulkMutation = useMutation({
+    mutationFn: api.reviews.bulk,
+    onSuccess: (result, action: ReviewBulkAction) => {
+      const ids = new Set(action.ids ?? []);
+      queryClient.setQueryData<Review[]>(['admin-reviews'], (current) => {
+        if (!current) return current;
+        if (action.action === "delete") return current.filter(r => !ids.has(r.id));
+        return current.map(r => ids.has(r.id) ? { ...r, is_approved: action.action === "approve" } : r);
+      });
+      setSelectedIds(new Set());
+      toast({ title: `${result.affected} review(s) updated` });
+    },
+    onError: (error: Error) => {
+      toast({
+        title: "Failed to moderate reviews",
+        description: error.message,
+        variant: "destructive"
+      });
+    }
+  });
+
+  const filteredReviews = reviews?.filter(review =>
+    filter === "all" ||
+    (filter === "approved" && review.is_approved) ||
+    (filter === "hidden" && !review.is_approved)
+  ) || [];
+
+  const allSelected = filteredReviews.length > 0 && filteredReviews.every(r => selectedIds.has(r.id));
+
+  const toggleSelected = (id: number, checked: boolean) => {
+    setSelectedIds(current => {
+      const next = new Set(current);
+      if (checked) next.add(id); else next.delete(id);
+      return next;
+    });
+  };
+
+  const toggleAll = (checked: boolean) => {
+    setSelectedIds(checked ? new Set(filteredReviews.map(r => r.id)) : new Set());
+  };
+
+  const runBulk = (action: ReviewBulkAction["action"], ids: number[]) => {
+    if (ids.length > 0) bulkMutation.mutate({ action, ids });
+  };
+
+  if (isLoading) {
+    return <div className="container mx-auto px-4 py-16 text-center">Loading reviews...</div>;
+  }
+
+  if (error) {
+    return (
+      <div className="container mx-auto px-4 py-16 text-center">
+        <AlertCircle className="h-12 w-12 text-destructive mx-auto mb-4" />
+        <p className="text-muted-foreground">Failed to load reviews</p>
+      </div>
+    );
+  }
+
+  const selected = Array.from(selectedIds);
+
+  return (
+    <div className="container mx-auto px-4 py-8">
+      <div className="flex items-center gap-4 mb-8">
+        <Link href="/admin">
+          <Button variant="ghost" size="icon">
+            <ArrowLeft className="h-4 w-4" />
+          </Button>
+        </Link>
+        <MessageSquare className="h-8 w-8 text-primary" />
+        <h1 className="text-3xl font-serif font-bold">Moderate Reviews</h1>
+      </div>
+
+      {/* Filter */}
+      <div className="mb-6 flex gap-2 items-center">
+        <span className="text-sm font-medium">Filter:</span>
+        <Select value={filter} onValueChange={setFilter}>
+          <SelectTrigger className="w-[180px]">
+            <SelectValue />
+          </SelectTrigger>
+          <SelectContent>
+            <SelectItem value="all">All Reviews</SelectItem>
+            <SelectItem value="approved">Approved</SelectItem>
+            <SelectItem value="hidden">Rejected</SelectItem>
+          </SelectContent>
+        </Select>
+        <span className="text-sm text-muted-foreground ml-2">
+          {filteredReviews.length} review(s)
+        </span>
+      </div>
+
+      {/* Bulk actions */}
+      <div className="mb-6 flex flex-wrap gap-2 items-center">
+        <Checkbox
+          checked={allSelected}
+          onCheckedChange={(checked) => toggleAll(checked === true)}
+          aria-label="Select all reviews"
+        />
+        <span className="text-sm font-medium">{selectedIds.size} selected</span>
+        <Button size="sm" variant="outline" disabled={selected.length === 0 || bulkMutation.isPending}
+          onClick={() => runBulk("approve", selected)}>
+          <Check className="h-4 w-4 mr-2" /> Approve
+        </Button>
+        <Button size="sm" variant="outline" disabled={selected.length === 0 || bulkMutation.isPending}
+          onClick={() => runBulk("reject", selected)}>
+          <X className="h-4 w-4 mr-2" /> Reject
+        </Button>
+        <Button size="sm" variant="destructive" disabled={selected.length === 0 || bulkMutation.isPending}
+          onClick={() => runBulk("delete", selected)}>
+          <Trash2 className="h-4 w-4 mr-2" /> Delete
+        </Button>
+      </div>
+
+      {/* Reviews List */}
+      <div className="space-y-4">
+        {filteredReviews.length === 0 ? (
+          <Card>
+            <CardContent className="py-16 text-center">
+              <MessageSquare className="h-16 w-16 text-muted-foreground mx-auto mb-4" />
+              <p className="text-muted-foreground">No reviews found</p>
+            </CardContent>
+          </Card>
+        ) : (
+          filteredReviews.map((review) => (
+            <Card key={review.id}>
+              <CardContent className="p-6 flex gap-4 items-start">
+                <Checkbox
+                  className="mt-1"
+                  checked={selectedIds.has(review.id)}
+                  onCheckedChange={(checked) => toggleSelected(review.id, checked === true)}
+                  aria-label={`Select review ${review.id}`}
+                />
+                <div className="flex-1 space-y-2">
+                  <div className="flex flex-wrap justify-between gap-2">
+                    <div>
+                      <p className="font-bold">
+                        {productNames.get(review.product_id) ?? `Product #${review.product_id}`}
+                      </p>
+                      <p className="text-sm text-muted-foreground">
+                        {review.username} · {format(new Date(review.created_at), 'MMM dd, yyyy')}
+                      </p>
+                    </div>
+                    <Badge variant={review.is_approved ? "default" : "secondary"}>
+                      {review.is_approved ? "Approved" : "Rejected"}
+                    </Badge>
+                  </div>
+                  <div className="flex gap-1">
+                    {[1, 2, 3, 4, 5].map((value) => (
+                      <Star
+                        key={value}
+                        className={`h-4 w-4 ${value <= review.rating ? "fill-yellow-400 text-yellow-400" : "text-gray-300"}`}
+                      />
+                    ))}
+                  </div>
+                  {review.comment && <p className="text-sm">{review.comment}</p>}
+                </div>
+              </CardContent>
+            </Card>
+          ))
+        )}
+      </div>
+    </div>
+  );
+}
@@ -1,10 +1,11 @@
-import { useCart } from "@/lib/cart-context";
+import { useCart, useFreshCart } from "@/lib/cart-context";
 import { Button } from "@/components/ui/button";
 import { Trash2, Plus, Minus, ArrowRight, ShoppingBag } from "lucide-react";
 import { Link } from "wouter";
 
 export default function Cart() {
   const { items, removeFromCart, updateQuantity, cartTotal } = useCart();
+  useFreshCart();
 
   if (items.length === 0) {
     return (
@@ -1,4 +1,4 @@
-import { useCart } from "@/lib/cart-context";
+import { useCart, useFreshCart } from "@/lib/cart-context";
 import { useAuth } from "@/lib/auth-context";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
@@ -10,6 +10,7 @@ import { z } from "zod";
 import { useToast } from "@/hooks/use-toast";
 import { useLocation } from "wouter";
 import { api } from "@/lib/api";
+import { useRef } from "react";
 
 const checkoutSchema = z.object({
   fullName: z.string().min(2, "Name is required"),
@@ -22,9 +23,13 @@ type CheckoutForm = z.infer<typeof checkoutSchema>;
 
 export default function Checkout() {
   const { items, cartTotal, clearCart } = useCart();
+  useFreshCart();
   const { user } = useAuth();
   const { toast } = useToast();
   const [, setLocation] = useLocation();
+  // Reuse the same Idempotency-Key when retrying an identical order so a
+  // request that succeeded but timed out client-side isn't placed twice
+  const pendingOrder = useRef<{ key: string; body: string } | null>(null);
 
   const { register, handleSubmit, formState: { errors, isSubmitting } } = useForm<CheckoutForm>({
     resolver: zodResolver(checkoutSchema),
@@ -53,7 +58,14 @@ export default function Checkout() {
         }))),
       };
 
-      const result = await api.orders.create(orderData);
+      const body = JSON.stringify(orderData);
+      let pending = pendingOrder.current;
+      if (!pending || pending.body !== body) {
+        pending = { key: crypto.randomUUID(), body };
+        pendingOrder.current = pending;
+      }
+      const result = await api.orders.create(orderData, pending.key);
+      pendingOrder.current = null;
 
       toast({
         title: "Order Placed Successfully!",
@@ -14,8 +14,9 @@ export default function Home() {
   const { role } = useAuth();
   
   const { data: products, isLoading, error } = useQuery({
-    queryKey: ['products'],
-    queryFn: api.products.list,
+    // Same query as the catalog page; ProductCard needs the full product
+    queryKey: ['products', 'all'],
+    queryFn: () => api.products.catalog(),
     retry: false
   });
 
@@ -1,16 +1,22 @@
-import { useQuery } from "@tanstack/react-query";
-import { api } from "@/lib/api";
+import { useInfiniteQuery } from "@tanstack/react-query";
+import { api, ORDER_PAGE_SIZE } from "@/lib/api";
 import { Card, CardContent } from "@/components/ui/card";
+import { Button } from "@/components/ui/button";
 import { Badge } from "@/components/ui/badge";
 import { Package, Loader2, AlertCircle } from "lucide-react";
 import { format } from "date-fns";
 
 export default function OrderHistory() {
-  const { data: orders, isLoading, error } = useQuery({
+  const { data, isLoading, error, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
     queryKey: ['my-orders'],
-    queryFn: api.orders.myOrders,
+    // A customer's full history, including orders moved to the archive, a page at a time
+    queryFn: ({ pageParam }) => api.orders.myOrders(true, pageParam),
+    initialPageParam: 0,
+    getNextPageParam: (lastPage, pages) =>
+      lastPage.length < ORDER_PAGE_SIZE ? undefined : pages.length * ORDER_PAGE_SIZE,
     retry: false
   });
+  const orders = data?.pages.flat();
 
   const getStatusColor = (status: string) => {
     switch (status) {
@@ -105,6 +111,13 @@ export default function OrderHistory() {
               </Card>
             );
           })}
+          {hasNextPage && (
+            <div className="flex justify-center">
+              <Button variant="outline" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+                {isFetchingNextPage ? <Loader2 className="h-4 w-4 animate-spin" /> : "Load older orders"}
+              </Button>
+            </div>
+          )}
         </div>
       )}
     </div>
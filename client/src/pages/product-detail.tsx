@@ -7,6 +7,7 @@ import NotFound from "./not-found";
 import { useQuery } from "@tanstack/react-query";
 import { api } from "@/lib/api";
 import { ReviewSection } from "@/components/ReviewSection";
+import { ProductCard } from "@/components/ui/product-card";
 
 export default function ProductDetail() {
   const { addToCart } = useCart();
@@ -19,6 +20,13 @@ export default function ProductDetail() {
     retry: false
   });
 
+  const { data: related } = useQuery({
+    queryKey: ['product', params?.id, 'related'],
+    queryFn: () => api.products.related(Number(params?.id)),
+    enabled: !!params?.id,
+    retry: false
+  });
+
   if (!match) return <NotFound />;
 
   if (isLoading) {
@@ -104,6 +112,18 @@ export default function ProductDetail() {
         </div>
       </div>
 
+      {/* Frequently bought together */}
+      {related && related.length > 0 && (
+        <div className="mt-16">
+          <h2 className="text-2xl font-serif font-bold mb-6">Frequently Bought Together</h2>
+          <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-4 gap-6">
+            {related.map((item) => (
+              <ProductCard key={item.id} product={item} />
+            ))}
+          </div>
+        </div>
+      )}
+
       {/* Reviews Section */}
       <div className="mt-16">
         <ReviewSection productId={product.id} />
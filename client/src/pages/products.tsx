@@ -13,23 +13,39 @@ export default function Products() {
   const { role } = useAuth();
   const [search, setSearch] = useState("");
   const [category, setCategory] = useState<string | null>(null);
+  const [popularFirst, setPopularFirst] = useState(false);
 
   const { data: products, isLoading, error } = useQuery({
-    queryKey: ['products'],
-    queryFn: api.products.list,
+    // The full catalog: search matches both the English and the Bangla name
+    queryKey: ['products', 'all'],
+    queryFn: () => api.products.catalog(),
     retry: false
   });
 
+  // The catalog itself comes from the static snapshot; only the ranking is asked of the API
+  const { data: popularity } = useQuery({
+    queryKey: ['products', 'popular'],
+    queryFn: () => api.products.list({ fields: ['id'], sort: 'popular' }),
+    enabled: popularFirst,
+    staleTime: 60_000
+  });
+  const popularityRank = new Map<number, number>(popularity?.map((p, index) => [p.id, index]) ?? []);
+
   const categories = ["all", "bed", "sofa", "cupboard", "door"];
 
   const filteredProducts = products?.filter((product) => {
     const matchesSearch = 
-      product.nameEn.toLowerCase().includes(search.toLowerCase()) ||
-      product.nameBn.includes(search);
+      product.nameEn?.toLowerCase().includes(search.toLowerCase()) ||
+      product.nameBn?.includes(search);
     const matchesCategory = category === "all" || !category || product.category === category;
     return matchesSearch && matchesCategory;
   }) || [];
 
+  if (popularFirst && popularity) {
+    const rank = (id: number) => popularityRank.get(id) ?? Number.MAX_SAFE_INTEGER;
+    filteredProducts.sort((a, b) => rank(a.id) - rank(b.id));
+  }
+
   // Guests see only 6 products, logged-in users see all
   const displayProducts = role === 'guest' 
     ? filteredProducts.slice(0, 6) 
@@ -73,6 +89,13 @@ export default function Products() {
                 {cat}
               </Button>
             ))}
+            <Button
+              variant={popularFirst ? "default" : "outline"}
+              onClick={() => setPopularFirst(!popularFirst)}
+              className="whitespace-nowrap"
+            >
+              Most popular
+            </Button>
           </div>
         </div>
       </div>
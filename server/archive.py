@@ -0,0 +1,64 @@
+"""Move old completed/cancelled orders from `orders` into `orders_archive`.
+
+Runs in batches, one transaction per batch, so the orders table is never
+locked for long. Also runs as the "archive_orders" background task (tasks.py).
+
+    python archive.py --older-than-days 90 --batch-size 1000
+"""
+import argparse
+from datetime import datetime, timedelta
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.orm import Session
+import models
+from database import SessionLocal, engine
+
+TERMINAL_STATUSES = ("completed", "cancelled")
+ARCHIVE_AFTER_DAYS = 90
+BATCH_SIZE = 1000
+
+ARCHIVED_COLUMNS = (
+    "id", "user_id", "customer_name", "customer_phone", "customer_address",
+    "total_amount", "items", "status", "created_at",
+)
+
+def archive_orders(db: Session, older_than_days: int = ARCHIVE_AFTER_DAYS, batch_size: int = BATCH_SIZE) -> int:
+    """Archive terminal orders older than the cutoff; returns the number moved"""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    order_columns = [getattr(models.Order, name) for name in ARCHIVED_COLUMNS]
+    archive_columns = [getattr(models.OrderArchive, name) for name in ARCHIVED_COLUMNS]
+    moved = 0
+    while True:
+        ids = [row.id for row in db.query(models.Order.id).filter(
+            models.Order.status.in_(TERMINAL_STATUSES),
+            models.Order.created_at < cutoff
+        ).order_by(models.Order.id).limit(batch_size)]
+        if not ids:
+            return moved
+
+        archived_at = datetime.utcnow()
+        db.execute(
+            insert(models.OrderArchive).from_select(
+                archive_columns + [models.OrderArchive.archived_at],
+                select(*order_columns, literal(archived_at, models.OrderArchive.archived_at.type)).where(models.Order.id.in_(ids))
+            )
+        )
+        db.execute(delete(models.Order).where(models.Order.id.in_(ids)))
+        db.commit()
+        moved += len(ids)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--older-than-days", type=int, default=ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        moved = archive_orders(db, args.older_than_days, args.batch_size)
+    finally:
+        db.close()
+    print(f"✅ Archived {moved} orders older than {args.older_than_days} days")
+
+if __name__ == "__main__":
+    main()
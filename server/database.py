@@ -1,14 +1,16 @@
+import os
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from deadlines import current_deadline
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./rubel_woodworks.db"
+# SQLite database URL (override with DATABASE_URL, e.g. for benchmarks)
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./rubel_woodworks.db")
 
 # Create engine
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Needed for SQLite
+    connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}  # Needed for SQLite
 )
 
 # Create SessionLocal class
@@ -17,9 +19,11 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
-# Dependency to get DB session
+# Dependency to get DB session; its statements are cut off at the request's
+# deadline (see deadlines.py)
 def get_db():
     db = SessionLocal()
+    db.info["deadline"] = current_deadline()
     try:
         yield db
     finally:
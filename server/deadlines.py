@@ -0,0 +1,117 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import event
+import metrics
+
+# Time budget for each HTTP request; database work past it is cancelled with a
+# 503. Set REQUEST_TIMEOUT_SECONDS=0 to disable.
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "10"))
+# SQLite calls the progress handler every this many VM instructions
+PROGRESS_HANDLER_OPS = 1000
+
+requests_timed_out_total = metrics.registry.register(metrics.Counter(
+    "http_requests_timed_out_total", "Requests whose database work was cancelled at the deadline",
+    ("method", "route")))
+
+class DeadlineExceeded(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Request took too long, please try again",
+            headers={"Retry-After": "1"},
+        )
+
+class Deadline:
+    """Absolute time budget of one request"""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+        self.exceeded = False
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self):
+        if self.expired():
+            self.exceeded = True
+            raise DeadlineExceeded()
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("request_deadline", default=None)
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+def instrument(engine, session_factory):
+    """Enforce session.info["deadline"] (set by database.get_db) on every statement.
+
+    SQLite gets a progress handler that interrupts a running statement once the
+    deadline passes; PostgreSQL gets SET LOCAL statement_timeout for the rest of
+    the budget. On any database, statements aren't started after the deadline.
+    """
+    dialect = engine.dialect.name
+
+    @event.listens_for(session_factory, "after_begin")
+    def after_begin(session, transaction, connection):
+        deadline = session.info.get("deadline")
+        if deadline is None:
+            return
+        deadline.check()
+        connection.info["deadline"] = deadline
+        if dialect == "sqlite":
+            connection.connection.dbapi_connection.set_progress_handler(deadline.expired, PROGRESS_HANDLER_OPS)
+        elif dialect == "postgresql":
+            timeout_ms = max(1, int(deadline.remaining() * 1000))
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        deadline = conn.info.get("deadline")
+        if deadline is not None:
+            deadline.check()
+
+    # Returned rather than raised, so the other handle_error listeners still run
+    @event.listens_for(engine, "handle_error", retval=True)
+    def handle_error(context):
+        connection = context.connection
+        deadline = connection.info.get("deadline") if connection is not None else None
+        if deadline is not None and deadline.expired():
+            # Interrupted by the progress handler or statement_timeout
+            deadline.exceeded = True
+            return DeadlineExceeded()
+        return None
+
+    # The deadline belongs to the request, not the pooled connection
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        if connection_record.info.pop("deadline", None) is not None and dialect == "sqlite":
+            dbapi_connection.set_progress_handler(None, 0)
+
+class DeadlineMiddleware:
+    """Pure ASGI middleware giving each HTTP request a Deadline"""
+
+    def __init__(self, app, timeout: Optional[float] = None):
+        self.app = app
+        # None follows REQUEST_TIMEOUT_SECONDS, read per request
+        self.timeout = timeout
+
+    async def __call__(self, scope, receive, send):
+        timeout = REQUEST_TIMEOUT_SECONDS if self.timeout is None else self.timeout
+        if scope["type"] != "http" or timeout <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = Deadline(timeout)
+        token = _current.set(deadline)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            if deadline.exceeded:
+                route = scope.get("route")
+                requests_timed_out_total.inc(scope["method"], getattr(route, "path", None) or "unmatched")
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+import metrics
+import models
+from database import SessionLocal
+
+logger = logging.getLogger("events")
+
+# Events kept for Last-Event-ID resume, and per-client queue bound before a
+# slow consumer is disconnected
+HISTORY_SIZE = 1000
+CLIENT_BUFFER_SIZE = 100
+HEARTBEAT_SECONDS = 15
+# How often each process looks for events published by the other workers
+POLL_INTERVAL_SECONDS = float(os.getenv("EVENTS_POLL_SECONDS", "0.5"))
+# Each process deletes rows older than the newest RETAIN_EVENTS this often
+RETAIN_EVENTS = 10 * HISTORY_SIZE
+PRUNE_INTERVAL_SECONDS = 60
+
+sse_subscribers = metrics.registry.register(metrics.Gauge(
+    "sse_subscribers", "Connected Server-Sent Events clients", ("stream",)))
+sse_dropped_total = metrics.registry.register(metrics.Counter(
+    "sse_dropped_total", "SSE clients disconnected for falling behind", ("stream",)))
+
+class Event:
+    __slots__ = ("id", "seq", "type", "data")
+
+    def __init__(self, id: str, seq: int, type: str, data: str):
+        self.id = id
+        self.seq = seq
+        self.type = type
+        self.data = data
+
+    def encode(self) -> bytes:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n".encode()
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, backlog: List[Event], after: int, buffer_size: int):
+        self.loop = loop
+        self.backlog = backlog
+        # Highest event id the client already has
+        self.after = after
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = False
+
+    def deliver(self, event: Event):
+        """Runs on the subscriber's event loop"""
+        if self.dropped or event.seq <= self.after:
+            return
+        self.after = event.seq
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow: discard what's queued and tell the stream to close
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+class EventBroker:
+    """Pub/sub for one SSE stream, shared by every server process.
+
+    add() writes the event to the stream_events table in the caller's
+    transaction, so an event exists exactly when its change commits (an
+    outbox). Each process tails that table (poll()) to feed its own
+    subscribers, so a client sees every event whichever worker it is connected
+    to; notify() after the commit delivers to this process's clients without
+    waiting for the next tick. The event id is the row id, so a client can
+    resume with Last-Event-ID on any worker; one whose id has fallen out of
+    the history gets a "reset" event telling it to refetch instead of
+    silently missing events. Ids follow commit order because SQLite has one
+    writer at a time; on a server database an event committed after a higher
+    id was already read is skipped.
+    """
+
+    def __init__(self, name: str, history_size: int = HISTORY_SIZE, buffer_size: int = CLIENT_BUFFER_SIZE,
+                 interval: float = POLL_INTERVAL_SECONDS):
+        self.name = name
+        self.buffer_size = buffer_size
+        self.interval = interval
+        # Id of the newest event delivered; None until the first poll
+        self._last_id: Optional[int] = None
+        self._history: deque = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def add(self, db: Session, event_type: str, data: dict):
+        """Queue an event in `db`'s transaction; call notify() once it commits"""
+        self.add_all(db, [(event_type, data)])
+
+    def add_all(self, db: Session, events: list):
+        """Queue (type, data) events in `db`'s transaction with one INSERT"""
+        if not events:
+            return
+        if self._last_id is None:
+            # Start following the table before our own rows are in it
+            self.notify()
+        db.execute(models.StreamEvent.__table__.insert(), [
+            {"stream": self.name, "type": event_type, "data": json.dumps(data, default=str)}
+            for event_type, data in events
+        ])
+
+    def notify(self):
+        """Deliver committed events to this process's subscribers now.
+
+        Never raises: the change has already been committed, and the tailer
+        thread picks the events up on its next tick anyway.
+        """
+        try:
+            self.poll()
+        except Exception:
+            logger.exception("Failed to read %s events", self.name)
+
+    def poll(self) -> int:
+        """Hand events published since the last poll (by any process) to our subscribers"""
+        with self._poll_lock:
+            db = SessionLocal()
+            try:
+                if self._last_id is None:
+                    latest = db.query(func.max(models.StreamEvent.id)).filter(
+                        models.StreamEvent.stream == self.name
+                    ).scalar()
+                    self._last_id = latest or 0
+                    return 0
+                rows = db.query(models.StreamEvent).filter(
+                    models.StreamEvent.stream == self.name,
+                    models.StreamEvent.id > self._last_id
+                ).order_by(models.StreamEvent.id).limit(self._history.maxlen).all()
+            finally:
+                db.close()
+            if not rows:
+                return 0
+            events = [Event(str(row.id), row.id, row.type, row.data) for row in rows]
+            with self._lock:
+                self._history.extend(events)
+                self._last_id = events[-1].seq
+                subscribers = [s for s in self._subscribers if not s.dropped]
+            for subscription in subscribers:
+                for event in events:
+                    subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            return len(events)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            backlog, after = self._backlog(last_event_id)
+            subscription = Subscription(loop, backlog, after, self.buffer_size)
+            self._subscribers.add(subscription)
+        sse_subscribers.inc(self.name)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription not in self._subscribers:
+                return
+            self._subscribers.remove(subscription)
+        sse_subscribers.dec(self.name)
+        if subscription.dropped:
+            sse_dropped_total.inc(self.name)
+
+    def _backlog(self, last_event_id: Optional[str]):
+        """Events to replay for a resuming client, and the id it is caught up to"""
+        last_id = self._last_id or 0
+        if not last_event_id:
+            return [], last_id
+        if not last_event_id.isdigit():
+            return [Event(str(last_id), last_id, "reset", "{}")], last_id
+        seq = int(last_event_id)
+        if seq >= last_id:
+            # Seen on another worker ahead of our last poll; skip up to it
+            return [], seq
+        oldest = self._history[0].seq if self._history else last_id + 1
+        if seq < oldest - 1:
+            return [Event(str(last_id), last_id, "reset", "{}")], last_id
+        return [event for event in self._history if event.seq > seq], last_id
+
+    def start(self):
+        self.poll()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-events", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def prune(self):
+        """Delete rows well behind what every client can still resume from"""
+        if not self._last_id:
+            return
+        db = SessionLocal()
+        try:
+            db.query(models.StreamEvent).filter(
+                models.StreamEvent.stream == self.name,
+                models.StreamEvent.id <= self._last_id - RETAIN_EVENTS
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _run(self):
+        pruned_at = time.monotonic()
+        while not self._stopping.wait(self.interval):
+            self.notify()
+            if time.monotonic() - pruned_at >= PRUNE_INTERVAL_SECONDS:
+                pruned_at = time.monotonic()
+                try:
+                    self.prune()
+                except Exception:
+                    logger.exception("Failed to prune %s events", self.name)
+
+async def event_stream(broker: EventBroker, subscription: Subscription, request):
+    """Async generator yielding SSE frames until the client disconnects or is dropped"""
+    try:
+        yield b"retry: 3000\n: connected\n\n"
+        for event in subscription.backlog:
+            yield event.encode()
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": heartbeat\n\n"
+                continue
+            if event is None:
+                break
+            yield event.encode()
+    finally:
+        broker.unsubscribe(subscription)
+
+# Admin order feed: order_created, order_updated, order_deleted
+order_events = EventBroker("orders")
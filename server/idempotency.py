@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import metrics
+import models
+from database import SessionLocal
+
+# How long a key is remembered, and how many completed keys stay in memory
+IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+CACHE_MAX_ENTRIES = 10000
+# How long a duplicate waits for the original request in this process to finish
+IN_FLIGHT_WAIT_SECONDS = 10
+PURGE_INTERVAL_SECONDS = 600
+# An in_progress claim older than this belongs to a worker that died between
+# claiming and committing; another request may take it over. Keep it well above
+# REQUEST_TIMEOUT_SECONDS so a live request is never overtaken.
+CLAIM_LEASE_SECONDS = float(os.getenv("IDEMPOTENCY_CLAIM_LEASE_SECONDS", "60"))
+
+def request_fingerprint(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+class IdempotencyStore:
+    """Replay cache for idempotent POSTs: LRU+TTL in memory, backed by the idempotency_keys table.
+
+    begin() either returns the stored response for a completed key or claims the
+    key for the caller, who must then call complete() (in the same transaction as
+    the work) or abandon(). Concurrent duplicates in this process wait for the
+    first request; duplicates in other workers see the committed claim and get 409
+    until it completes, is abandoned, or its lease runs out.
+    """
+
+    def __init__(self, ttl: int = IDEMPOTENCY_TTL_SECONDS, max_entries: int = CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, request_hash, response)
+        self._in_flight = {}  # key -> threading.Event
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    def begin(self, db: Session, key: str, request_hash: str) -> Optional[dict]:
+        while True:
+            with self._lock:
+                cached = self._cached(key)
+                event = self._in_flight.get(key) if cached is None else None
+                if cached is None and event is None:
+                    self._in_flight[key] = threading.Event()
+            if cached is not None:
+                metrics.record_cache("idempotency", True)
+                return self._check_hash(cached, request_hash)
+            if event is None:
+                break
+            # Same key already being processed in this worker: wait for its result
+            if not event.wait(IN_FLIGHT_WAIT_SECONDS):
+                raise self._conflict()
+
+        metrics.record_cache("idempotency", False)
+        try:
+            return self._claim(db, key, request_hash)
+        except BaseException:
+            self._release(key)
+            raise
+
+    def complete(self, db: Session, key: str, response: dict):
+        """Record the response; call before committing the work so both land atomically"""
+        db.query(models.IdempotencyKey).filter(models.IdempotencyKey.key == key).update(
+            {"status": "completed", "response_body": json.dumps(response, default=str)},
+            synchronize_session=False,
+        )
+
+    def finish(self, key: str, request_hash: str, response: dict):
+        """Publish a committed response to the cache and wake waiting duplicates"""
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.ttl, request_hash, response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        self._release(key)
+
+    def abandon(self, db: Session, key: str):
+        """Drop the claim after a failed request so the client can retry with the same key"""
+        try:
+            db.rollback()
+            # Not on `db`: if the request failed at its deadline, that session
+            # refuses to start another transaction
+            cleanup = SessionLocal()
+            try:
+                cleanup.query(models.IdempotencyKey).filter(
+                    models.IdempotencyKey.key == key,
+                    models.IdempotencyKey.status == "in_progress"
+                ).delete(synchronize_session=False)
+                cleanup.commit()
+            finally:
+                cleanup.close()
+        finally:
+            self._release(key)
+
+    def _claim(self, db: Session, key: str, request_hash: str) -> Optional[dict]:
+        self._purge_expired(db)
+        db.add(models.IdempotencyKey(key=key, request_hash=request_hash, status="in_progress"))
+        try:
+            db.commit()
+            return None
+        except IntegrityError:
+            db.rollback()
+
+        row = db.query(models.IdempotencyKey).filter(models.IdempotencyKey.key == key).first()
+        if row is None:
+            # Claim was abandoned between our insert and lookup; let the client retry
+            raise self._conflict()
+        if row.status != "completed":
+            if self._take_over(db, key, request_hash):
+                return None
+            raise self._conflict()
+        response = json.loads(row.response_body)
+        self.finish(key, row.request_hash, response)
+        return self._check_hash((None, row.request_hash, response), request_hash)
+
+    def _take_over(self, db: Session, key: str, request_hash: str) -> bool:
+        """Claim `key` if its in_progress claim has outlived the lease"""
+        now = datetime.utcnow()
+        taken = db.query(models.IdempotencyKey).filter(
+            models.IdempotencyKey.key == key,
+            models.IdempotencyKey.status == "in_progress",
+            models.IdempotencyKey.created_at < now - timedelta(seconds=CLAIM_LEASE_SECONDS)
+        ).update({"request_hash": request_hash, "created_at": now}, synchronize_session=False)
+        db.commit()
+        return taken == 1
+
+    def _cached(self, key: str):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry
+
+    def _release(self, key: str):
+        with self._lock:
+            event = self._in_flight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def _purge_expired(self, db: Session):
+        now = time.monotonic()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        db.query(models.IdempotencyKey).filter(
+            models.IdempotencyKey.created_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def _check_hash(entry, request_hash: str) -> dict:
+        if entry[1] != request_hash:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used with a different request body"
+            )
+        return entry[2]
+
+    @staticmethod
+    def _conflict() -> HTTPException:
+        return HTTPException(
+            status_code=409,
+            detail="A request with this Idempotency-Key is still being processed",
+            headers={"Retry-After": "1"},
+        )
+
+# Shared store for POST /api/orders
+order_idempotency = IdempotencyStore()
@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import metrics
+import models
+from database import SessionLocal
+
+logger = logging.getLogger("jobs")
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Idle workers re-check the table this often (enqueue also wakes them on commit)
+POLL_INTERVAL_SECONDS = 2.0
+# A running job whose worker died is handed out again after this long. The
+# worker running a job renews its lease every LEASE_SECONDS / 3, so long jobs
+# (e.g. archival) aren't handed out twice.
+LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+BACKOFF_BASE_SECONDS = 2
+BACKOFF_MAX_SECONDS = 600
+# Completed jobs are kept this long for inspection, then deleted
+DONE_RETENTION_DAYS = 7
+PURGE_INTERVAL_SECONDS = 600
+
+jobs_processed_total = metrics.registry.register(metrics.Counter(
+    "jobs_processed_total", "Background jobs processed", ("name", "result")))
+
+# Task name -> handler(payload: dict)
+TASKS: Dict[str, Callable[[dict], None]] = {}
+
+def task(name: str):
+    """Register a function as a background task handler"""
+    def decorator(func):
+        TASKS[name] = func
+        return func
+    return decorator
+
+def enqueue(db: Session, name: str, payload: Optional[dict] = None, delay: float = 0, max_attempts: int = 5):
+    """Add a job to the caller's transaction; it becomes visible to workers on commit"""
+    if name not in TASKS:
+        raise ValueError(f"Unknown task: {name}")
+    job = models.Job(
+        name=name,
+        payload=json.dumps(payload or {}),
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+        max_attempts=max_attempts,
+    )
+    db.add(job)
+    if not db.info.get("wake_job_workers"):
+        db.info["wake_job_workers"] = True
+        event.listen(db, "after_commit", _wake_workers, once=True)
+    return job
+
+def enqueue_once(db: Session, name: str, payload: Optional[dict] = None, delay: float = 0):
+    """Enqueue unless a job with this name is already waiting to run.
+
+    With a delay this debounces bursts: everything that happens before the
+    pending job starts is handled by that one run.
+    """
+    pending = db.query(models.Job.id).filter(
+        models.Job.status == "pending",
+        models.Job.name == name
+    ).first()
+    if pending is None:
+        return enqueue(db, name, payload, delay=delay)
+
+def _wake_workers(session):
+    session.info.pop("wake_job_workers", None)
+    queue.wake()
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+class JobQueue:
+    """Thread pool draining the jobs table. Safe to run in several processes:
+    a job is claimed with a conditional UPDATE, so only one worker gets it."""
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = workers
+        self._wakeup = threading.Condition()
+        self._pending_wakeups = 0
+        self._stopping = threading.Event()
+        self._threads = []
+        self._last_purge = 0.0
+
+    def start(self):
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 10):
+        """Stop taking new jobs and wait for running ones to finish"""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self):
+        with self._wakeup:
+            self._pending_wakeups += 1
+            self._wakeup.notify()
+
+    def run_pending(self) -> int:
+        """Process due jobs in the calling thread until none are left (used by scripts)"""
+        processed = 0
+        while self._run_one():
+            processed += 1
+        return processed
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self._purge_done()
+                if self._run_one():
+                    continue
+            except Exception:
+                logger.exception("Job worker error")
+            with self._wakeup:
+                if self._pending_wakeups == 0 and not self._stopping.is_set():
+                    self._wakeup.wait(POLL_INTERVAL_SECONDS)
+                self._pending_wakeups = 0
+
+    def _run_one(self) -> bool:
+        db = SessionLocal()
+        try:
+            job = self._claim(db)
+            if job is None:
+                return False
+            name = job.name
+            handler = TASKS.get(name)
+            finished = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._renew_lease, args=(job.id, job.attempts, finished),
+                name=f"job-lease-{job.id}", daemon=True
+            )
+            heartbeat.start()
+            try:
+                try:
+                    if handler is None:
+                        raise LookupError(f"No handler registered for task {name!r}")
+                    handler(json.loads(job.payload or "{}"))
+                finally:
+                    finished.set()
+                    heartbeat.join()
+            except Exception:
+                db.rollback()
+                self._record_failure(db, job, traceback.format_exc(limit=5))
+            else:
+                job.status = "done"
+                job.locked_at = None
+                db.commit()
+                jobs_processed_total.inc(name, "done")
+            return True
+        finally:
+            db.close()
+
+    def _renew_lease(self, job_id: int, attempt: int, finished: threading.Event):
+        """Push locked_at forward while this worker is still running the job"""
+        while not finished.wait(LEASE_SECONDS / 3):
+            db = SessionLocal()
+            try:
+                renewed = db.query(models.Job).filter(
+                    models.Job.id == job_id,
+                    models.Job.status == "running",
+                    models.Job.attempts == attempt
+                ).update({"locked_at": datetime.utcnow()}, synchronize_session=False)
+                db.commit()
+                if not renewed:
+                    logger.warning("Lost the lease on job %s", job_id)
+                    return
+            except Exception:
+                logger.exception("Failed to renew the lease on job %s", job_id)
+            finally:
+                db.close()
+
+    def _purge_done(self):
+        now = time.monotonic()
+        if now - self._last_purge < PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        db = SessionLocal()
+        try:
+            db.query(models.Job).filter(
+                models.Job.status == "done",
+                models.Job.updated_at < datetime.utcnow() - timedelta(days=DONE_RETENTION_DAYS)
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _claim(self, db: Session) -> Optional[models.Job]:
+        now = datetime.utcnow()
+        lease_expired = now - timedelta(seconds=LEASE_SECONDS)
+        while True:
+            candidate = db.query(models.Job.id).filter(
+                ((models.Job.status == "pending") & (models.Job.run_at <= now)) |
+                ((models.Job.status == "running") & (models.Job.locked_at < lease_expired))
+            ).order_by(models.Job.run_at).first()
+            if candidate is None:
+                return None
+            claimed = db.query(models.Job).filter(
+                models.Job.id == candidate.id,
+                ((models.Job.status == "pending") |
+                 ((models.Job.status == "running") & (models.Job.locked_at < lease_expired)))
+            ).update(
+                {"status": "running", "locked_at": now, "attempts": models.Job.attempts + 1},
+                synchronize_session=False,
+            )
+            db.commit()
+            if claimed:
+                return db.query(models.Job).filter(models.Job.id == candidate.id).first()
+            # Another worker won the race for this job; look for the next one
+
+    def _record_failure(self, db: Session, job: models.Job, error: str):
+        job.last_error = error
+        job.locked_at = None
+        if job.attempts >= job.max_attempts:
+            job.status = "failed"
+            logger.error("Job %s (%s) failed permanently after %s attempts", job.id, job.name, job.attempts)
+        else:
+            job.status = "pending"
+            job.run_at = datetime.utcnow() + timedelta(seconds=backoff_seconds(job.attempts))
+        result = job.status
+        db.commit()
+        jobs_processed_total.inc(job.name, result)
+
+queue = JobQueue()
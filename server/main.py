@@ -1,16 +1,30 @@
-﻿from fastapi import FastAPI
+﻿from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 import models
+import migrations
 from routers import reviews
 from database import engine, SessionLocal
 from auth import get_password_hash
-from routers import products, auth, orders, users
+from search_index import build_product_index, init_revision
+import snapshots
+from jobs import queue as job_queue
+from view_counts import view_counter
+from events import order_events
+import tasks  # registers background task handlers
+import metrics
+import profiling
+import deadlines
+import os
+from routers import products, auth, orders, users, jobs
 
 # Initialize FastAPI app FIRST
 app = FastAPI(title="Decorvibe Furniture API")
 
+# Metrics are on by default; set METRICS_ENABLED=0 to skip the middleware entirely
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
 # CORS Configuration - MUST BE RIGHT AFTER APP INIT
 app.add_middleware(
     CORSMiddleware,
@@ -20,8 +34,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Now create database tables
+if METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument_engine(engine)
+
+# Per-request SQL query counts/timings, slow-query log and Server-Timing (DEBUG=1)
+app.add_middleware(profiling.ProfilingMiddleware)
+
+# Per-request time budget (REQUEST_TIMEOUT_SECONDS), enforced on database statements
+app.add_middleware(deadlines.DeadlineMiddleware)
+deadlines.instrument(engine, SessionLocal)
+profiling.instrument_engine(engine)
+
+# Now create database tables, then bring existing ones up to date
 models.Base.metadata.create_all(bind=engine)
+migrations.upgrade(engine)
 
 # Mount static files for uploads
 Path("static/uploads").mkdir(parents=True, exist_ok=True)
@@ -33,9 +60,15 @@ app.include_router(auth.router)
 app.include_router(orders.router)
 app.include_router(users.router)
 app.include_router(reviews.router)
+app.include_router(jobs.router)
+
+# Prometheus scrape endpoint
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        return Response(metrics.registry.render(), media_type="text/plain; version=0.0.4")
 
 # Mount frontend static files in production AFTER API routers
-import os
 if os.getenv("NODE_ENV") == "production":
     frontend_dist = Path("../dist/public")
     if frontend_dist.exists():
@@ -47,7 +80,6 @@ def root():
     return {"message": "Welcome to Decorvibe Furniture API"}
 
 # Create default admin user on startup
-@app.on_event("startup")
 def create_default_admin():
     db = SessionLocal()
     try:
@@ -70,6 +102,77 @@ def create_default_admin():
     finally:
         db.close()
 
+# Build the in-memory product name index used by /api/products/suggest
+def load_product_index():
+    db = SessionLocal()
+    try:
+        build_product_index(db)
+    finally:
+        db.close()
+
+# Create the catalog_state row the workers' indexes follow
+def init_catalog_state():
+    db = SessionLocal()
+    try:
+        init_revision(db)
+    finally:
+        db.close()
+
+# Make sure a static catalog snapshot exists and matches the database
+def publish_catalog_snapshot():
+    db = SessionLocal()
+    try:
+        snapshots.publish(db)
+    finally:
+        db.close()
+
+# Set once the startup tasks have run; serve.py runs them in the parent before
+# forking workers so admin seeding and the snapshot happen once
+STARTUP_TASKS_DONE = False
+
+@app.on_event("startup")
+def run_startup_tasks():
+    global STARTUP_TASKS_DONE
+    if STARTUP_TASKS_DONE:
+        return
+    create_default_admin()
+    init_catalog_state()
+    publish_catalog_snapshot()
+    STARTUP_TASKS_DONE = True
+
+# The search index is per process: each worker builds its own after fork, then
+# follows catalog_state.revision (see search_index.py)
+@app.on_event("startup")
+def start_product_index():
+    load_product_index()
+
+# Background job workers run in every server process (threads don't survive fork)
+@app.on_event("startup")
+def start_job_workers():
+    job_queue.start()
+
+@app.on_event("shutdown")
+def stop_job_workers():
+    job_queue.stop()
+
+# Each process flushes its own product view counts, and once more on shutdown
+@app.on_event("startup")
+def start_view_counter():
+    view_counter.start()
+
+@app.on_event("shutdown")
+def stop_view_counter():
+    view_counter.stop()
+
+# Each process tails stream_events so its SSE clients see every worker's events
+@app.on_event("startup")
+def start_event_tailers():
+    order_events.start()
+
+@app.on_event("shutdown")
+def stop_event_tailers():
+    order_events.stop()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
@@ -0,0 +1,217 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Tuple
+from sqlalchemy import event
+
+# Latency buckets in seconds (Prometheus client defaults)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def get(self, *label_values) -> float:
+        return self._values.get(label_values, 0)
+
+    def label_sets(self):
+        return list(self._values)
+
+    def samples(self):
+        for key, value in list(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labels, key)} {value}"
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *label_values, amount: float = 1):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values, value: float):
+        with self._lock:
+            self._values[label_values] = value
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, *label_values, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(label_values)
+            if row is None:
+                row = self._values[label_values] = [0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def count(self, *label_values) -> int:
+        row = self._values.get(label_values)
+        return sum(row[:-1]) if row else 0
+
+    def samples(self):
+        for key, row in list(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {row[-1]}"
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """Register a callable run before each scrape to refresh gauges"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+# HTTP metrics
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "Total HTTP requests", ("method", "route", "status")))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", ("method",)))
+
+# Database pool metrics
+db_pool_checkouts_total = registry.register(Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool"))
+db_pool_checkout_wait_seconds = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)))
+db_pool_checked_out = registry.register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out"))
+db_pool_size = registry.register(Gauge(
+    "db_pool_size", "Configured pool size"))
+db_pool_overflow = registry.register(Gauge(
+    "db_pool_overflow", "Connections opened beyond the pool size"))
+
+# Cache metrics, reported by any in-process cache via record_cache()
+cache_requests_total = registry.register(Counter(
+    "cache_requests_total", "Cache lookups", ("cache", "result")))
+cache_hit_ratio = registry.register(Gauge(
+    "cache_hit_ratio", "Cache hit ratio since startup", ("cache",)))
+
+def record_cache(cache: str, hit: bool):
+    cache_requests_total.inc(cache, "hit" if hit else "miss")
+
+def _collect_cache_ratios():
+    caches = {key[0] for key in cache_requests_total.label_sets()}
+    for cache in caches:
+        hits = cache_requests_total.get(cache, "hit")
+        total = hits + cache_requests_total.get(cache, "miss")
+        cache_hit_ratio.set(cache, value=hits / total if total else 0.0)
+
+registry.add_collector(_collect_cache_ratios)
+
+def instrument_engine(engine):
+    """Track checkout counts and wait time for the engine's connection pool.
+
+    Wraps the engine rather than its pool: engine.dispose() (serve.py calls it
+    after fork) swaps in a new pool, and Engine.raw_connection() always checks
+    out of the current one.
+    """
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection():
+        start = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            db_pool_checkout_wait_seconds.observe(value=time.perf_counter() - start)
+
+    engine.raw_connection = timed_raw_connection
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checkouts_total.inc()
+
+    def collect():
+        for gauge, attr in ((db_pool_checked_out, "checkedout"), (db_pool_size, "size"),
+                            (db_pool_overflow, "overflow")):
+            method = getattr(engine.pool, attr, None)
+            if method is not None:
+                gauge.set(value=method())
+
+    registry.add_collector(collect)
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route request counts and latencies.
+
+    The route label is the matched path template (e.g. /api/products/{product_id}),
+    so cardinality stays bounded by the routers rather than by ids in URLs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec(method)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            http_requests_total.inc(method, path, str(status_code))
+            http_request_duration_seconds.observe(method, path, value=elapsed)
@@ -0,0 +1,162 @@
+"""Versioned schema migrations.
+
+create_all() only creates missing tables, so any change to an existing table
+(new indexes, columns) is added here as the next numbered migration. Applied
+versions are recorded in schema_migrations; main.py applies pending ones on
+startup, or run them by hand:
+
+    python migrations.py upgrade    # apply pending migrations
+    python migrations.py status     # list applied/pending migrations
+
+tests/test_query_plans.py checks that the busiest queries use these indexes.
+"""
+import argparse
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+import models
+from database import engine
+
+# The orders table as of migration 5, frozen so later model changes don't
+# alter what this migration builds
+ORDERS_AUTOINCREMENT_DDL = [
+    """CREATE TABLE orders (
+        id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        customer_name VARCHAR NOT NULL,
+        customer_phone VARCHAR NOT NULL,
+        customer_address VARCHAR,
+        total_amount FLOAT NOT NULL,
+        items VARCHAR,
+        status VARCHAR,
+        created_at DATETIME,
+        FOREIGN KEY(user_id) REFERENCES users (id)
+    )""",
+    "CREATE INDEX ix_orders_id ON orders (id)",
+    "CREATE INDEX ix_orders_created_at ON orders (created_at)",
+    "CREATE INDEX ix_orders_user_id_created_at ON orders (user_id, created_at)",
+    "CREATE INDEX ix_orders_customer_phone ON orders (customer_phone)",
+]
+
+def _table_sql(conn, name: str) -> Optional[str]:
+    return conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": name}).scalar()
+
+def _columns(conn, table: str) -> list:
+    return [row[1] for row in conn.execute(text(f"PRAGMA table_info({table})"))]
+
+def rebuild_orders_autoincrement(conn):
+    """Recreate orders as AUTOINCREMENT (SQLite only).
+
+    Without it SQLite hands out max(id) + 1, so once the newest orders are
+    archived their ids are reused: archiving them again collides in
+    orders_archive and the recommendations watermark skips the new orders.
+    The sequence starts past the highest archived id as well.
+
+    pysqlite only opens a transaction before DML, so the DDL below would
+    otherwise commit statement by statement; an explicit BEGIN makes the whole
+    rebuild roll back on failure. A copy left half-done by an earlier attempt
+    (orders_rebuild still present) is finished rather than skipped.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    if not conn.connection.dbapi_connection.in_transaction:
+        conn.exec_driver_sql("BEGIN")
+
+    if _table_sql(conn, "orders_rebuild") is None:
+        if "AUTOINCREMENT" in _table_sql(conn, "orders").upper():
+            _start_orders_sequence(conn)
+            return
+        indexes = [row[0] for row in conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'orders' AND sql IS NOT NULL"))]
+        for index in indexes:
+            conn.execute(text(f"DROP INDEX {index}"))
+        conn.execute(text("ALTER TABLE orders RENAME TO orders_rebuild"))
+    if _table_sql(conn, "orders") is None:
+        for statement in ORDERS_AUTOINCREMENT_DDL:
+            conn.execute(text(statement))
+
+    columns = ", ".join(name for name in _columns(conn, "orders_rebuild") if name in _columns(conn, "orders"))
+    conn.execute(text(
+        f"INSERT INTO orders ({columns}) SELECT {columns} FROM orders_rebuild "
+        "WHERE id NOT IN (SELECT id FROM orders)"
+    ))
+    conn.execute(text("DROP TABLE orders_rebuild"))
+    _start_orders_sequence(conn)
+
+def _start_orders_sequence(conn):
+    conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'orders'"))
+    conn.execute(text(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'orders', COALESCE(MAX(id), 0) "
+        "FROM (SELECT id FROM orders UNION ALL SELECT id FROM orders_archive)"
+    ))
+
+# (version, description, statements). Statements must be safe to re-run on a
+# database created by create_all(), which already has the indexes the models
+# declare; a statement may also be a function taking the connection.
+MIGRATIONS = [
+    (1, "index orders.created_at", [
+        "CREATE INDEX IF NOT EXISTS ix_orders_created_at ON orders (created_at)",
+    ]),
+    (2, "index orders by user_id, created_at", [
+        "CREATE INDEX IF NOT EXISTS ix_orders_user_id_created_at ON orders (user_id, created_at)",
+    ]),
+    (3, "index customer_phone on orders and orders_archive", [
+        "CREATE INDEX IF NOT EXISTS ix_orders_customer_phone ON orders (customer_phone)",
+        "CREATE INDEX IF NOT EXISTS ix_orders_archive_customer_phone ON orders_archive (customer_phone)",
+    ]),
+    (4, "index reviews by product_id, is_approved, created_at", [
+        "CREATE INDEX IF NOT EXISTS ix_reviews_product_id_is_approved_created_at "
+        "ON reviews (product_id, is_approved, created_at)",
+    ]),
+    (5, "never reuse order ids", [rebuild_orders_autoincrement]),
+    (6, "index orders_archive by user_id, created_at", [
+        "CREATE INDEX IF NOT EXISTS ix_orders_archive_user_id_created_at ON orders_archive (user_id, created_at)",
+    ]),
+]
+
+def applied_versions(bind) -> set:
+    models.SchemaMigration.__table__.create(bind=bind, checkfirst=True)
+    with bind.connect() as conn:
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+def upgrade(bind=engine) -> list:
+    """Apply pending migrations in order, each in its own transaction; returns the versions applied"""
+    done = applied_versions(bind)
+    applied = []
+    for version, description, statements in MIGRATIONS:
+        if version in done:
+            continue
+        try:
+            with bind.begin() as conn:
+                for statement in statements:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(text(statement))
+                conn.execute(models.SchemaMigration.__table__.insert().values(
+                    version=version, description=description, applied_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            # Another process applied it first
+            continue
+        applied.append(version)
+    return applied
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["upgrade", "status"])
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+
+    if args.command == "upgrade":
+        applied = upgrade()
+        print(f"✅ Applied migrations: {applied}" if applied else "✅ Database is up to date")
+    else:
+        done = applied_versions(engine)
+        for version, description, _ in MIGRATIONS:
+            print(f"{version:>4}  {'applied' if version in done else 'pending':<8} {description}")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-﻿from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Text
+﻿from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -37,6 +37,7 @@ class Product(Base):
     
     # ADD THIS RELATIONSHIP
     reviews = relationship("Review", back_populates="product", cascade="all, delete-orphan")
+    stats = relationship("ProductStats", uselist=False, cascade="all, delete-orphan")
 
 class Order(Base):
     __tablename__ = "orders"
@@ -44,16 +45,40 @@ class Order(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # ADD THIS
     customer_name = Column(String, nullable=False)
-    customer_phone = Column(String, nullable=False)
+    customer_phone = Column(String, nullable=False, index=True)
     customer_address = Column(String, nullable=True)
     total_amount = Column(Float, nullable=False)
     items = Column(String, nullable=True)
     status = Column(String, default="pending")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    # Indexes added to existing databases by migrations.py. AUTOINCREMENT so an
+    # id is never handed out again once its order has been archived and deleted
+    __table_args__ = (
+        Index("ix_orders_user_id_created_at", "user_id", "created_at"),
+        {"sqlite_autoincrement": True},
+    )
     
     # ADD THIS RELATIONSHIP
     user = relationship("User", back_populates="orders")
 
+class OrderArchive(Base):
+    """Completed/cancelled orders moved out of the hot orders table by archive.py"""
+    __tablename__ = "orders_archive"
+
+    id = Column(Integer, primary_key=True)  # same id the order had in orders
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    customer_name = Column(String, nullable=False)
+    customer_phone = Column(String, nullable=False, index=True)
+    customer_address = Column(String, nullable=True)
+    total_amount = Column(Float, nullable=False)
+    items = Column(String, nullable=True)
+    status = Column(String, nullable=False)
+    created_at = Column(DateTime, index=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (Index("ix_orders_archive_user_id_created_at", "user_id", "created_at"),)
+
 class Review(Base):
     __tablename__ = "reviews"
 
@@ -67,4 +92,94 @@ class Review(Base):
     
     # Relationships
     product = relationship("Product", back_populates="reviews")
-    user = relationship("User", back_populates="reviews")
\ No newline at end of file
+    user = relationship("User", back_populates="reviews")
+
+    __table_args__ = (
+        Index("ix_reviews_product_id_is_approved_created_at", "product_id", "is_approved", "created_at"),
+    )
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)  # "<user id>:<Idempotency-Key header>"
+    request_hash = Column(String, nullable=False)
+    status = Column(String, default="in_progress")  # in_progress, completed
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    payload = Column(Text, nullable=True)  # JSON
+    status = Column(String, default="pending", index=True)  # pending, running, done, failed
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=5)
+    run_at = Column(DateTime, default=datetime.utcnow, index=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SchemaMigration(Base):
+    """Versions applied by migrations.py"""
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True)
+    description = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+class ProductPairCount(Base):
+    """How many orders contained both products; stored in both directions"""
+    __tablename__ = "product_pair_counts"
+
+    product_id = Column(Integer, primary_key=True)
+    related_id = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class RelatedProduct(Base):
+    """Top products bought together with product_id, built by recommendations.py"""
+    __tablename__ = "related_products"
+
+    product_id = Column(Integer, primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    related_id = Column(Integer, nullable=False)
+    score = Column(Integer, nullable=False)
+
+class RecommendationState(Base):
+    """Single row: the highest order id counted into product_pair_counts"""
+    __tablename__ = "recommendation_state"
+
+    id = Column(Integer, primary_key=True)
+    last_order_id = Column(Integer, nullable=False)
+    built_at = Column(DateTime, default=datetime.utcnow)
+
+class CatalogState(Base):
+    """Single row: bumped by every product write so each server process can
+    tell its in-memory search index is stale"""
+    __tablename__ = "catalog_state"
+
+    id = Column(Integer, primary_key=True)
+    revision = Column(Integer, nullable=False, default=0)
+
+class ProductStats(Base):
+    """Per-product view count, written in batches by view_counts.ViewCounter"""
+    __tablename__ = "product_stats"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    views = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class StreamEvent(Base):
+    """Server-Sent Events published by any server process; each process tails
+    this table to feed its own subscribers (see events.EventBroker)"""
+    __tablename__ = "stream_events"
+    # AUTOINCREMENT so ids (the SSE event ids) are never reused after pruning
+    __table_args__ = (Index("ix_stream_events_stream_id", "stream", "id"), {"sqlite_autoincrement": True})
+
+    id = Column(Integer, primary_key=True)
+    stream = Column(String, nullable=False)
+    type = Column(String, nullable=False)
+    data = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, default=datetime.utcnow)
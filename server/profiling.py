@@ -0,0 +1,126 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+from sqlalchemy import event
+import metrics
+
+logger = logging.getLogger("sql.profiling")
+
+# Emit Server-Timing headers with per-request query stats when DEBUG=1
+DEBUG = os.getenv("DEBUG", "0") == "1"
+# Statements slower than this are logged with the route that issued them
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+
+db_queries_total = metrics.registry.register(metrics.Counter(
+    "db_queries_total", "SQL statements executed, by route", ("route",)))
+db_query_seconds_total = metrics.registry.register(metrics.Counter(
+    "db_query_seconds_total", "Time spent executing SQL statements, by route", ("route",)))
+
+class QueryStats:
+    """Query count and total time for one request (or one query_budget block)"""
+
+    def __init__(self, scope: Optional[dict] = None, keep_statements: bool = False):
+        self.scope = scope
+        self.count = 0
+        self.duration = 0.0
+        self.keep_statements = keep_statements
+        self.statements: List[str] = []
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route") if self.scope else None
+        return getattr(route, "path", None) or "unmatched"
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.duration += elapsed
+        if self.keep_statements:
+            self.statements.append(statement)
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# Open query_budget() blocks; these see every request's statements regardless
+# of thread, but not background work (job workers, flushers, the SSE poller)
+_budgets: List[QueryStats] = []
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+def instrument_engine(engine):
+    """Attribute every statement executed on `engine` to the current request"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        route = stats.route if stats else "background"
+        if stats:
+            stats.record(statement, elapsed)
+            for budget in _budgets:
+                budget.record(statement, elapsed)
+        db_queries_total.inc(route)
+        db_query_seconds_total.inc(route, amount=elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            logger.warning("Slow query (%.1f ms) on %s: %s", elapsed * 1000, route, statement)
+
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    # so the list kept on the pooled connection doesn't grow
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        connection = context.connection
+        if context.execution_context is not None and connection is not None:
+            starts = connection.info.get("query_start")
+            if starts:
+                starts.pop()
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware that opens a QueryStats for each HTTP request"""
+
+    def __init__(self, app, server_timing: bool = DEBUG):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if self.server_timing and message["type"] == "http.response.start":
+                header = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+
+@contextmanager
+def query_budget(max_queries: int):
+    """Fail if requests inside the block run more than `max_queries` statements.
+
+    Intended for tests, e.g.:
+
+        with query_budget(3):
+            client.get("/api/products/1/reviews")
+    """
+    stats = QueryStats(keep_statements=True)
+    _budgets.append(stats)
+    try:
+        yield stats
+    finally:
+        _budgets.remove(stats)
+    if stats.count > max_queries:
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {stats.count}:\n" + "\n".join(stats.statements)
+        )
@@ -0,0 +1,129 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from fastapi import HTTPException, Request, status
+import metrics
+
+# Set RATE_LIMITS_ENABLED=0 to disable all limiters (e.g. for local load tests)
+RATE_LIMITS_ENABLED = os.getenv("RATE_LIMITS_ENABLED", "1") != "0"
+# Only honour X-Forwarded-For when running behind a trusted reverse proxy
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "0") == "1"
+
+requests_shed_total = metrics.registry.register(metrics.Counter(
+    "requests_shed_total", "Requests rejected by rate limiting or load shedding", ("limiter", "reason")))
+
+class TokenBucketLimiter:
+    """Per-key token buckets: `burst` requests at once, refilled at `rate_per_minute`.
+
+    Keys are kept in LRU order and capped at `max_keys` so a flood of distinct
+    IPs or usernames can't grow memory without bound. Buckets live in process
+    memory: under serve.py each worker has its own, so the effective limit is
+    the configured one times the number of workers.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_keys: int = 50000):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, consume: bool = True) -> Optional[float]:
+        """Take one token for `key` (or just look, with consume=False);
+        return None if allowed, else seconds until retry"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.burst), now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                if consume:
+                    bucket[0] -= 1
+                return None
+            return (1 - bucket[0]) / self.rate
+
+    def check(self, key: str, consume: bool = True):
+        """Raise 429 with Retry-After if `key` is out of tokens"""
+        if not RATE_LIMITS_ENABLED:
+            return
+        retry_after = self.hit(key, consume)
+        if retry_after is not None:
+            requests_shed_total.inc(self.name, "rate_limited")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+class ConcurrencyLimiter:
+    """Caps concurrent executions of an expensive route; excess requests get 503 instead of queueing"""
+
+    def __init__(self, name: str, limit: int, retry_after: int = 1):
+        self.name = name
+        self.limit = limit
+        self.retry_after = retry_after
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self.in_flight = metrics.registry.register(metrics.Gauge(
+            f"{name}_in_flight", f"Requests currently admitted by the {name} limiter"))
+
+    def __call__(self):
+        """FastAPI dependency holding a slot for the duration of the request"""
+        if not RATE_LIMITS_ENABLED:
+            yield
+            return
+        if not self._semaphore.acquire(blocking=False):
+            requests_shed_total.inc(self.name, "overloaded")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        self.in_flight.inc()
+        try:
+            yield
+        finally:
+            self.in_flight.dec()
+            self._semaphore.release()
+
+def client_ip(request: Request) -> str:
+    if TRUST_PROXY_HEADERS:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def limit_by_ip(limiter: TokenBucketLimiter):
+    """Build a FastAPI dependency applying `limiter` to the client IP"""
+    def dependency(request: Request):
+        limiter.check(client_ip(request))
+    return dependency
+
+# Limiters for the expensive routes. bcrypt work (login/register) shares one
+# concurrency cap; order creation takes a SQLite write lock so gets its own.
+# All of them are per process (see TokenBucketLimiter).
+# Both login_username buckets only count failed logins. login_username is keyed
+# by username and client IP, so one guesser is stopped quickly without locking
+# the owner out from their own IP. login_account is keyed by username alone and
+# catches guessing spread over many IPs; its larger burst means a spray has to
+# fail many times before the account is refused from everywhere.
+login_ip_limiter = TokenBucketLimiter("login_ip", rate_per_minute=20, burst=10)
+login_username_limiter = TokenBucketLimiter("login_username", rate_per_minute=5, burst=5)
+login_account_limiter = TokenBucketLimiter("login_account", rate_per_minute=10, burst=30)
+register_ip_limiter = TokenBucketLimiter("register_ip", rate_per_minute=5, burst=5)
+order_ip_limiter = TokenBucketLimiter("order_ip", rate_per_minute=30, burst=10)
+
+password_hashing_slots = ConcurrencyLimiter(
+    "password_hashing", limit=int(os.getenv("PASSWORD_HASHING_CONCURRENCY", "4")))
+order_write_slots = ConcurrencyLimiter(
+    "order_write", limit=int(os.getenv("ORDER_WRITE_CONCURRENCY", "8")))
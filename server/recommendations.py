@@ -0,0 +1,206 @@
+"""Precomputed "frequently bought together" recommendations.
+
+Pair counts of products bought in the same order live in product_pair_counts
+(both directions), and the top RELATED_TOP_K per product in related_products,
+so GET /api/products/{id}/related is a single primary-key range lookup.
+
+A full build recounts every non-cancelled order, archived ones included. An
+incremental refresh only counts orders newer than the watermark in
+recommendation_state; create_order schedules one (debounced) after each
+order. Status changes after an order was counted are only picked up by the
+next full build.
+
+    python recommendations.py            # incremental refresh
+    python recommendations.py --full     # rebuild from scratch
+"""
+import argparse
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from itertools import combinations
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+import models
+from database import SessionLocal, engine
+from jobs import enqueue_once
+
+RELATED_TOP_K = 12
+# Orders with more distinct products than this only count their first ones
+MAX_ITEMS_PER_ORDER = 50
+# Orders placed within this window are folded into one incremental refresh
+REFRESH_DELAY_SECONDS = int(os.getenv("RECOMMENDATIONS_REFRESH_SECONDS", "300"))
+READ_BATCH = 10_000
+
+class StaleWatermark(Exception):
+    """Another refresh committed first; this one was rolled back"""
+
+def order_product_ids(items: Optional[str]) -> list:
+    """Distinct product ids in an Order.items JSON blob"""
+    try:
+        parsed = json.loads(items or "[]")
+    except ValueError:
+        return []
+    ids = set()
+    for item in parsed if isinstance(parsed, list) else []:
+        if isinstance(item, dict) and isinstance(item.get("id"), int):
+            ids.add(item["id"])
+    return sorted(ids)[:MAX_ITEMS_PER_ORDER]
+
+def count_pairs(item_blobs: Iterable[Optional[str]]) -> Counter:
+    """Co-occurrence counts keyed by (smaller id, larger id)"""
+    pairs = Counter()
+    for items in item_blobs:
+        ids = order_product_ids(items)
+        if len(ids) > 1:
+            pairs.update(combinations(ids, 2))
+    return pairs
+
+def _order_items(db: Session, table, after_id: int, up_to_id: int):
+    rows = db.execute(
+        select(table.c["items"]).where(
+            table.c.id > after_id,
+            table.c.id <= up_to_id,
+            table.c.status != "cancelled"
+        ).execution_options(yield_per=READ_BATCH)
+    )
+    for (items,) in rows:
+        yield items
+
+def _claim_watermark(db: Session, old: Optional[int], new: int):
+    """Move the watermark first, so a concurrent refresh blocks here and then fails"""
+    now = datetime.utcnow()
+    if old is None:
+        db.add(models.RecommendationState(id=1, last_order_id=new, built_at=now))
+        try:
+            db.flush()
+        except IntegrityError:
+            raise StaleWatermark()
+        return
+    claimed = db.execute(
+        update(models.RecommendationState)
+        .where(models.RecommendationState.id == 1, models.RecommendationState.last_order_id == old)
+        .values(last_order_id=new, built_at=now)
+    ).rowcount
+    if not claimed:
+        raise StaleWatermark()
+
+def _expand(pairs: Dict[Tuple[int, int], int]):
+    for (a, b), count in pairs.items():
+        yield a, b, count
+        yield b, a, count
+
+def _write_top_k(db: Session, product_ids: set):
+    """Recompute related_products for the given products from product_pair_counts"""
+    counts = models.ProductPairCount
+    for chunk in _chunks(sorted(product_ids), 500):
+        db.execute(delete(models.RelatedProduct).where(models.RelatedProduct.product_id.in_(chunk)))
+        rows = db.execute(
+            select(counts.product_id, counts.related_id, counts.count)
+            .where(counts.product_id.in_(chunk))
+            .order_by(counts.product_id, counts.count.desc(), counts.related_id)
+        )
+        ranked, rank, current = [], 0, None
+        for product_id, related_id, count in rows:
+            rank = rank + 1 if product_id == current else 1
+            current = product_id
+            if rank <= RELATED_TOP_K:
+                ranked.append({"product_id": product_id, "rank": rank, "related_id": related_id, "score": count})
+        if ranked:
+            db.execute(models.RelatedProduct.__table__.insert(), ranked)
+
+def _chunks(values: list, size: int):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def rebuild(db: Session) -> int:
+    """Recount every order; returns the number of product pairs"""
+    state = db.get(models.RecommendationState, 1)
+    watermark = max(
+        db.query(func.max(models.Order.id)).scalar() or 0,
+        db.query(func.max(models.OrderArchive.id)).scalar() or 0
+    )
+    _claim_watermark(db, state.last_order_id if state else None, watermark)
+
+    pairs = count_pairs(_order_items(db, models.Order.__table__, 0, watermark))
+    pairs.update(count_pairs(_order_items(db, models.OrderArchive.__table__, 0, watermark)))
+
+    db.execute(delete(models.ProductPairCount))
+    rows = [{"product_id": a, "related_id": b, "count": n} for a, b, n in _expand(pairs)]
+    for chunk in _chunks(rows, READ_BATCH):
+        db.execute(models.ProductPairCount.__table__.insert(), chunk)
+    db.execute(delete(models.RelatedProduct))
+    _write_top_k(db, {a for a, _, _ in _expand(pairs)})
+    db.commit()
+    return len(pairs)
+
+def refresh(db: Session) -> int:
+    """Count orders placed since the last build; returns the number of orders read"""
+    state = db.get(models.RecommendationState, 1)
+    if state is None:
+        rebuild(db)
+        return 0
+    watermark = db.query(func.max(models.Order.id)).scalar() or 0
+    if watermark <= state.last_order_id:
+        return 0
+    old = state.last_order_id
+    _claim_watermark(db, old, watermark)
+
+    blobs = list(_order_items(db, models.Order.__table__, old, watermark))
+    pairs = count_pairs(blobs)
+    counts = models.ProductPairCount
+    increments = {(a, b): n for a, b, n in _expand(pairs)}
+    affected = {a for a, _ in increments}
+    for chunk in _chunks(sorted(affected), 500):
+        # Prefix lookup on the (product_id, related_id) primary key
+        existing = set(db.execute(
+            select(counts.product_id, counts.related_id).where(counts.product_id.in_(chunk))
+        ).tuples())
+        chunk = set(chunk)
+        keys = [key for key in increments if key[0] in chunk]
+        updates = [{"a": a, "b": b, "n": increments[(a, b)]} for a, b in keys if (a, b) in existing]
+        inserts = [{"product_id": a, "related_id": b, "count": increments[(a, b)]}
+                   for a, b in keys if (a, b) not in existing]
+        if updates:
+            db.execute(
+                counts.__table__.update()
+                .where(counts.product_id == bindparam("a"), counts.related_id == bindparam("b"))
+                .values(count=counts.count + bindparam("n")),
+                updates
+            )
+        if inserts:
+            db.execute(counts.__table__.insert(), inserts)
+    _write_top_k(db, affected)
+    db.commit()
+    return len(blobs)
+
+def schedule_refresh(db: Session):
+    """Queue an incremental refresh in the caller's transaction unless one is already waiting"""
+    enqueue_once(db, "refresh_recommendations", {}, delay=REFRESH_DELAY_SECONDS)
+
+def related_products(db: Session, product_id: int, limit: int = RELATED_TOP_K):
+    return db.query(models.Product).join(
+        models.RelatedProduct, models.RelatedProduct.related_id == models.Product.id
+    ).filter(
+        models.RelatedProduct.product_id == product_id
+    ).order_by(models.RelatedProduct.rank).limit(limit).all()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="Rebuild from all orders")
+    args = parser.parse_args()
+
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if args.full:
+            print(f"✅ Rebuilt recommendations from {rebuild(db)} product pairs")
+        else:
+            print(f"✅ Counted {refresh(db)} new orders")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
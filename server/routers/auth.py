@@ -1,4 +1,4 @@
-﻿from fastapi import APIRouter, Depends, HTTPException, status
+﻿from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -11,18 +11,42 @@ from auth import (
     get_current_user,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from ratelimit import (
+    client_ip,
+    limit_by_ip,
+    login_ip_limiter,
+    login_username_limiter,
+    login_account_limiter,
+    register_ip_limiter,
+    password_hashing_slots
+)
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 # Login endpoint
-@router.post("/login", response_model=schemas.Token)
-async def login(
+# Sync handler so bcrypt runs in the threadpool instead of blocking the event loop;
+# rate limited per IP, failed attempts limited per username and IP and per
+# username, and capped on concurrent password checks
+@router.post(
+    "/login",
+    response_model=schemas.Token,
+    dependencies=[Depends(limit_by_ip(login_ip_limiter)), Depends(password_hashing_slots)]
+)
+def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
+    # Only failed attempts spend a token; refuse once they're used up
+    account = form_data.username.lower()
+    failure_key = f"{account}|{client_ip(request)}"
+    login_username_limiter.check(failure_key, consume=False)
+    login_account_limiter.check(account, consume=False)
     user = authenticate_user(db, form_data.username, form_data.password)
     
     if not user:
+        login_username_limiter.hit(failure_key)
+        login_account_limiter.hit(account)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -44,8 +68,12 @@ async def login(
     }
 
 # Registration endpoint
-@router.post("/register", response_model=schemas.Token)
-async def register(
+@router.post(
+    "/register",
+    response_model=schemas.Token,
+    dependencies=[Depends(limit_by_ip(register_ip_limiter)), Depends(password_hashing_slots)]
+)
+def register(
     user_data: schemas.UserCreate,
     db: Session = Depends(get_db)
 ):
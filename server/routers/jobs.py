@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import datetime
+import models
+import schemas
+from database import get_db
+from auth import get_current_admin_user
+from jobs import queue
+
+router = APIRouter(prefix="/api", tags=["jobs"])
+
+# Queue depth and recent failures (Admin only)
+@router.get("/admin/jobs", response_model=schemas.JobQueueStatus)
+def get_job_queue_status(
+    limit: int = 20,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user)
+):
+    """Job counts by status, number of due jobs and the most recent failures"""
+    counts = dict(
+        db.query(models.Job.status, func.count(models.Job.id)).group_by(models.Job.status).all()
+    )
+    due = db.query(func.count(models.Job.id)).filter(
+        models.Job.status == "pending",
+        models.Job.run_at <= datetime.utcnow()
+    ).scalar() or 0
+    failures = db.query(models.Job).filter(
+        models.Job.last_error.isnot(None),
+        models.Job.status.in_(["pending", "failed"])
+    ).order_by(models.Job.updated_at.desc()).limit(limit).all()
+
+    return {"counts": counts, "due": due, "failures": failures}
+
+# Requeue a failed job (Admin only)
+@router.post("/admin/jobs/{job_id}/retry", response_model=schemas.JobInfo)
+def retry_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user)
+):
+    """Reset a failed job so the workers pick it up again"""
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "failed":
+        raise HTTPException(status_code=400, detail="Only failed jobs can be retried")
+
+    job.status = "pending"
+    job.attempts = 0
+    job.run_at = datetime.utcnow()
+    db.commit()
+    db.refresh(job)
+    queue.wake()
+
+    return job
@@ -1,34 +1,108 @@
-﻿from fastapi import APIRouter, Depends, HTTPException
+﻿from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, cast, desc, func, null, select, union, union_all, update
 from typing import List, Optional
 import models
 import schemas
 from database import get_db
 from auth import get_current_admin_user, get_current_user
+from ratelimit import limit_by_ip, order_ip_limiter, order_write_slots
+from idempotency import order_idempotency, request_fingerprint
+from events import order_events, event_stream
+from jobs import enqueue
+from recommendations import schedule_refresh
+from archive import ARCHIVED_COLUMNS
 
 router = APIRouter(prefix="/api", tags=["orders"])
 
+VALID_ORDER_STATUSES = ["pending", "processing", "completed", "cancelled"]
+# Bulk updates touching more orders than this publish one "reset" event
+BULK_EVENT_LIMIT = 50
+
+# Archived orders are only returned a page at a time
+ARCHIVED_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def orders_query(user_id: Optional[int] = None):
+    """Hot orders, newest first"""
+    query = select(models.Order)
+    if user_id is not None:
+        query = query.where(models.Order.user_id == user_id)
+    return query.order_by(models.Order.created_at.desc())
+
+def orders_with_archived_query(user_id: Optional[int] = None, limit: int = ARCHIVED_PAGE_SIZE, offset: int = 0):
+    """One page of hot and archived orders, newest first.
+
+    Both sides are read in created_at index order, so SQLite merges the
+    UNION ALL without sorting either table and stops after the page.
+    """
+    sides = []
+    for model, archived_at in (
+        (models.Order, cast(null(), DateTime)),
+        (models.OrderArchive, models.OrderArchive.archived_at),
+    ):
+        side = select(*[getattr(model, name) for name in ARCHIVED_COLUMNS], archived_at.label("archived_at"))
+        if user_id is not None:
+            side = side.where(model.user_id == user_id)
+        sides.append(side)
+    return union_all(*sides).order_by(desc("created_at"), desc("id")).limit(limit).offset(offset)
+
+def customer_count_query():
+    """Distinct customer phone numbers across hot and archived orders"""
+    phones = union(select(models.Order.customer_phone), select(models.OrderArchive.customer_phone)).subquery()
+    return select(func.count()).select_from(phones)
+
+def list_orders(db: Session, user_id: Optional[int], include_archived: bool, limit: Optional[int], offset: int):
+    if include_archived:
+        return db.execute(orders_with_archived_query(user_id, limit or ARCHIVED_PAGE_SIZE, offset)).all()
+    query = orders_query(user_id).offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return db.scalars(query).all()
+
 # Get all orders (Admin only)
 @router.get("/orders", response_model=List[schemas.Order])
 def get_orders(
+    include_archived: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user)
+):
+    """Get all orders - Admin only. Archived orders only with ?include_archived=true,
+    ARCHIVED_PAGE_SIZE at a time unless ?limit= is given (page with ?offset=)"""
+    return list_orders(db, None, include_archived, limit, offset)
+
+# Live feed of order changes for the admin dashboard (Server-Sent Events)
+@router.get("/orders/stream")
+async def stream_orders(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user)
 ):
-    """Get all orders - Admin only"""
-    orders = db.query(models.Order).order_by(models.Order.created_at.desc()).all()
-    return orders
+    """Stream order_created/order_updated/order_deleted events - Admin only"""
+    # Don't hold a pooled connection for the lifetime of the stream
+    db.close()
+    subscription = order_events.subscribe(last_event_id)
+    return StreamingResponse(
+        event_stream(order_events, subscription, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 # Get user's own orders (Authenticated users)
 @router.get("/my-orders", response_model=List[schemas.Order])
 def get_my_orders(
+    include_archived: bool = False,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    """Get orders for the current logged-in user"""
-    orders = db.query(models.Order).filter(
-        models.Order.user_id == current_user.id
-    ).order_by(models.Order.created_at.desc()).all()
-    return orders
+    """Get orders for the current logged-in user; paged like GET /orders"""
+    return list_orders(db, current_user.id, include_archived, limit, offset)
 
 # Get dashboard stats (Admin only)
 @router.get("/stats")
@@ -36,12 +110,13 @@ def get_stats(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_admin_user)
 ):
-    from sqlalchemy import func
-
-    total_orders = db.query(func.count(models.Order.id)).scalar() or 0
-    total_sales = db.query(func.sum(models.Order.total_amount)).scalar() or 0
+    # Stats cover archived orders too
+    total_orders = (db.query(func.count(models.Order.id)).scalar() or 0) + \
+        (db.query(func.count(models.OrderArchive.id)).scalar() or 0)
+    total_sales = (db.query(func.sum(models.Order.total_amount)).scalar() or 0) + \
+        (db.query(func.sum(models.OrderArchive.total_amount)).scalar() or 0)
     total_products = db.query(func.count(models.Product.id)).scalar() or 0
-    total_customers = db.query(func.count(func.distinct(models.Order.customer_phone))).scalar() or 0
+    total_customers = db.scalar(customer_count_query()) or 0
 
     return {
         "total_sales": total_sales,
@@ -50,34 +125,110 @@ def get_stats(
         "total_products": total_products
     }
 
-# Create new order
-@router.post("/orders")
+# Archive old completed/cancelled orders in the background (Admin only)
+@router.post("/admin/orders/archive")
+def archive_old_orders(
+    archive: Optional[schemas.ArchiveRequest] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user)
+):
+    """Queue an archive_orders job"""
+    job = enqueue(db, "archive_orders", (archive or schemas.ArchiveRequest()).model_dump())
+    db.commit()
+    return {"message": "Archival queued", "job_id": job.id}
+
+# Create new order (rate limited per IP, capped on concurrent SQLite writes)
+@router.post(
+    "/orders",
+    dependencies=[Depends(limit_by_ip(order_ip_limiter)), Depends(order_write_slots)]
+)
 def create_order(
     order: schemas.OrderCreate,
     db: Session = Depends(get_db),
-    current_user: Optional[models.User] = Depends(get_current_user)
+    current_user: Optional[models.User] = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ):
-    """Create a new order - can be guest or authenticated"""
-    
-    # Create order in database
-    new_order = models.Order(
-        user_id=current_user.id if current_user else None,
-        customer_name=order.customer_name,
-        customer_phone=order.customer_phone,
-        customer_address=order.customer_address,
-        total_amount=order.total_amount,
-        items=order.items,
-        status="pending"
-    )
-    
-    db.add(new_order)
+    """Create a new order - can be guest or authenticated
+
+    Retries carrying the same Idempotency-Key get the original response back
+    without creating another order.
+    """
+    key = None
+    if idempotency_key:
+        key = f"{current_user.id if current_user else 'guest'}:{idempotency_key}"
+        request_hash = request_fingerprint(order.model_dump())
+        stored = order_idempotency.begin(db, key, request_hash)
+        if stored is not None:
+            return JSONResponse(content=stored, headers={"Idempotent-Replayed": "true"})
+
+    try:
+        # Create order in database
+        new_order = models.Order(
+            user_id=current_user.id if current_user else None,
+            customer_name=order.customer_name,
+            customer_phone=order.customer_phone,
+            customer_address=order.customer_address,
+            total_amount=order.total_amount,
+            items=order.items,
+            status="pending"
+        )
+
+        db.add(new_order)
+        db.flush()
+        response = {
+            "message": "Order created successfully",
+            "order_id": new_order.id
+        }
+        # Store the response in the same transaction as the order
+        if key:
+            order_idempotency.complete(db, key, response)
+        schedule_refresh(db)
+        order_events.add(db, "order_created", schemas.Order.model_validate(new_order).model_dump(mode="json"))
+        db.commit()
+    except BaseException:
+        if key:
+            order_idempotency.abandon(db, key)
+        raise
+
+    if key:
+        order_idempotency.finish(key, request_hash, response)
+    order_events.notify()
+    return response
+
+# Set the status of many orders at once (Admin only)
+@router.post("/orders/bulk-status", response_model=schemas.BulkResult)
+def bulk_update_order_status(
+    bulk: schemas.OrderBulkStatus,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user)
+):
+    """Update the status of the listed orders in a single statement"""
+    if bulk.status not in VALID_ORDER_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid status. Must be one of: {', '.join(VALID_ORDER_STATUSES)}"
+        )
+
+    affected = db.execute(
+        update(models.Order)
+        .where(models.Order.id.in_(bulk.ids))
+        .values(status=bulk.status)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    # Large batches would overflow SSE client buffers; tell clients to refetch instead
+    if affected > BULK_EVENT_LIMIT:
+        order_events.add(db, "reset", {})
+    elif affected:
+        # One INSERT for all the events, in the same transaction as the UPDATE
+        order_events.add_all(db, [
+            ("order_updated", schemas.Order.model_validate(order).model_dump(mode="json"))
+            for order in db.query(models.Order).filter(models.Order.id.in_(bulk.ids))
+        ])
     db.commit()
-    db.refresh(new_order)
-    
-    return {
-        "message": "Order created successfully",
-        "order_id": new_order.id
-    }
+    order_events.notify()
+
+    return {"affected": affected}
 
 # Update order status (Admin only)
 @router.put("/orders/{order_id}", response_model=schemas.Order)
@@ -95,16 +246,17 @@ def update_order_status(
         raise HTTPException(status_code=404, detail="Order not found")
     
     # Validate status
-    valid_statuses = ["pending", "processing", "completed", "cancelled"]
-    if order_update.status not in valid_statuses:
+    if order_update.status not in VALID_ORDER_STATUSES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            detail=f"Invalid status. Must be one of: {', '.join(VALID_ORDER_STATUSES)}"
         )
     
     order.status = order_update.status
+    order_events.add(db, "order_updated", schemas.Order.model_validate(order).model_dump(mode="json"))
     db.commit()
     db.refresh(order)
+    order_events.notify()
     
     return order
 
@@ -123,6 +275,8 @@ def delete_order(
         raise HTTPException(status_code=404, detail="Order not found")
     
     db.delete(order)
+    order_events.add(db, "order_deleted", {"id": order_id})
     db.commit()
+    order_events.notify()
     
     return {"message": "Order deleted successfully"}
\ No newline at end of file
@@ -1,10 +1,17 @@
-﻿from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+﻿from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 import models
 import schemas
 from database import get_db
 from auth import get_current_admin_user
+from search_index import product_index, bump_revision, refresh_product_index
+from jobs import enqueue
+from recommendations import related_products, RELATED_TOP_K
+from snapshots import schedule_publish
+from view_counts import view_counter
 import shutil
 import os
 from pathlib import Path
@@ -16,19 +23,132 @@ router = APIRouter(prefix="/api", tags=["products"])
 UPLOAD_DIR = "static/uploads"
 Path(UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
 
+MAX_BATCH_IDS = 100
+
+# ?fields= names; name and description have one column per language
+PRODUCT_FIELDS = {
+    "id": {None: "id"},
+    "name": {"en": "nameEn", "bn": "nameBn"},
+    "description": {"en": "descriptionEn", "bn": "descriptionBn"},
+    "price": {None: "price"},
+    "image": {None: "image"},
+    "category": {None: "category"},
+}
+
+def product_columns(lang: Optional[str], fields: Optional[str]):
+    """Columns to SELECT for a sparse product response, or None for the full schema"""
+    if lang is None and fields is None:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(PRODUCT_FIELDS)
+    unknown = [f for f in names if f not in PRODUCT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(PRODUCT_FIELDS)}"
+        )
+    columns = ["id"]
+    for name in names:
+        for column_lang, column in PRODUCT_FIELDS[name].items():
+            if lang and column_lang and column_lang != lang:
+                continue
+            if column not in columns:
+                columns.append(column)
+    return [getattr(models.Product, column) for column in columns]
+
 # Get all products
-@router.get("/products", response_model=List[schemas.Product])
-def get_products(db: Session = Depends(get_db)):
-    products = db.query(models.Product).all()
-    return products
+# ?lang=en|bn drops the other language's name/description; ?fields=id,name,price
+# selects only those columns. Either one returns a sparse object per product.
+# ?sort=popular orders by detail page views, most viewed first.
+@router.get("/products", response_model=Union[List[schemas.Product], List[schemas.ProductSparse]])
+def get_products(
+    lang: Optional[str] = Query(None, pattern="^(en|bn)$"),
+    fields: Optional[str] = Query(None, max_length=200),
+    sort: Optional[str] = Query(None, pattern="^popular$"),
+    db: Session = Depends(get_db)
+):
+    columns = product_columns(lang, fields)
+    query = db.query(*columns) if columns else db.query(models.Product)
+    if sort == "popular":
+        query = query.outerjoin(
+            models.ProductStats, models.ProductStats.product_id == models.Product.id
+        ).order_by(func.coalesce(models.ProductStats.views, 0).desc(), models.Product.id)
+    if columns is None:
+        return query.all()
+    return JSONResponse([row._asdict() for row in query])
+
+# Typeahead suggestions for the search box (served from the in-memory index)
+@router.get("/products/suggest", response_model=List[schemas.ProductSuggestion])
+def suggest_products(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    lang: str = Query("en", pattern="^(en|bn)$"),
+    limit: int = Query(8, ge=1, le=20),
+    db: Session = Depends(get_db)
+):
+    refresh_product_index(db)
+    return product_index.suggest(prefix, lang=lang, limit=limit)
+
+# Several products by id in one query, e.g. to refresh a cart
+@router.get("/products/batch", response_model=Union[schemas.ProductBatch, schemas.ProductBatchSparse])
+def get_products_batch(
+    ids: str = Query(..., min_length=1, max_length=1000, description="Comma-separated product ids"),
+    lang: Optional[str] = Query(None, pattern="^(en|bn)$"),
+    fields: Optional[str] = Query(None, max_length=200),
+    db: Session = Depends(get_db)
+):
+    """Products in request order, plus the ids that don't exist"""
+    try:
+        requested = list(dict.fromkeys(int(i) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if len(requested) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+
+    columns = product_columns(lang, fields)
+    query = db.query(*columns) if columns else db.query(models.Product)
+    found = {product.id: product for product in query.filter(models.Product.id.in_(requested))}
+    products = [found[i] for i in requested if i in found]
+    missing = [i for i in requested if i not in found]
+
+    if columns:
+        return JSONResponse({"products": [row._asdict() for row in products], "missing": missing})
+    return {"products": products, "missing": missing}
 
 # Get single product by ID
-@router.get("/products/{product_id}", response_model=schemas.Product)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(models.Product).filter(models.Product.id == product_id).first()
+@router.get("/products/{product_id}", response_model=Union[schemas.Product, schemas.ProductSparse])
+def get_product(
+    product_id: int,
+    lang: Optional[str] = Query(None, pattern="^(en|bn)$"),
+    fields: Optional[str] = Query(None, max_length=200),
+    db: Session = Depends(get_db)
+):
+    columns = product_columns(lang, fields)
+    query = db.query(*columns) if columns else db.query(models.Product)
+    product = query.filter(models.Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    # Counted in memory and written to product_stats in batches
+    view_counter.record(product_id)
+    return JSONResponse(product._asdict()) if columns else product
+
+# Frequently bought together (precomputed by recommendations.py)
+@router.get("/products/{product_id}/related", response_model=List[schemas.Product])
+def get_related_products(
+    product_id: int,
+    limit: int = Query(6, ge=1, le=RELATED_TOP_K),
+    db: Session = Depends(get_db)
+):
+    return related_products(db, product_id, limit)
+
+# Rebuild recommendations from all orders in the background (Admin only)
+@router.post("/admin/recommendations/rebuild")
+def rebuild_recommendations(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user)
+):
+    """Queue a full frequently-bought-together rebuild"""
+    job = enqueue(db, "refresh_recommendations", {"full": True})
+    db.commit()
+    return {"message": "Rebuild queued", "job_id": job.id}
 
 # Create new product (Admin only)
 @router.post("/products", response_model=schemas.Product)
@@ -67,8 +187,11 @@ async def create_product(
     )
 
     db.add(new_product)
+    schedule_publish(db)
+    bump_revision(db)
     db.commit()
     db.refresh(new_product)
+    product_index.add(new_product)
 
     return new_product
 
@@ -107,14 +230,9 @@ async def update_product(
 
     # Update image if new one is provided
     if image:
-        # Delete old image file
+        # Delete old image file in the background once the update commits
         if product.image:
-            old_image_path = product.image.replace("/static/", "static/")
-            if os.path.exists(old_image_path):
-                try:
-                    os.remove(old_image_path)
-                except Exception as e:
-                    print(f"Could not delete old image: {e}")
+            enqueue(db, "delete_upload", {"image": product.image})
 
         # Save new image with unique filename
         file_ext = os.path.splitext(image.filename)[1]
@@ -126,8 +244,11 @@ async def update_product(
         
         product.image = f"/static/uploads/{unique_filename}"
 
+    schedule_publish(db)
+    bump_revision(db)
     db.commit()
     db.refresh(product)
+    product_index.update(product)
 
     return product
 
@@ -143,16 +264,14 @@ def delete_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    # Delete the image file if it exists
+    # Delete the image file in the background once the delete commits
     if product.image:
-        image_path = product.image.replace("/static/", "static/")
-        if os.path.exists(image_path):
-            try:
-                os.remove(image_path)
-            except Exception as e:
-                print(f"Could not delete image: {e}")
+        enqueue(db, "delete_upload", {"image": product.image})
 
     db.delete(product)
+    schedule_publish(db)
+    bump_revision(db)
     db.commit()
+    product_index.remove(product_id)
 
     return {"message": "Product deleted successfully"}
\ No newline at end of file
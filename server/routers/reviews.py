@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select, update, delete
 from typing import List
 import models
 import schemas
@@ -9,6 +9,13 @@ from auth import get_current_user, get_current_admin_user
 
 router = APIRouter(prefix="/api", tags=["reviews"])
 
+def approved_reviews_query(product_id: int):
+    """A product's approved reviews, newest first, with their authors in the same query"""
+    return select(models.Review).options(joinedload(models.Review.user)).where(
+        models.Review.product_id == product_id,
+        models.Review.is_approved == True
+    ).order_by(models.Review.created_at.desc())
+
 # Get all approved reviews for a product
 @router.get("/products/{product_id}/reviews", response_model=List[schemas.ReviewResponse])
 def get_product_reviews(
@@ -16,15 +23,12 @@ def get_product_reviews(
     db: Session = Depends(get_db)
 ):
     """Get all approved reviews for a specific product"""
-    reviews = db.query(models.Review).filter(
-        models.Review.product_id == product_id,
-        models.Review.is_approved == True
-    ).order_by(models.Review.created_at.desc()).all()
+    reviews = db.scalars(approved_reviews_query(product_id)).all()
     
     # Add username to each review
     review_responses = []
     for review in reviews:
-        user = db.query(models.User).filter(models.User.id == review.user_id).first()
+        user = review.user
         review_dict = {
             "id": review.id,
             "product_id": review.product_id,
@@ -167,6 +171,36 @@ def update_review(
         "created_at": review.created_at
     }
 
+# Approve, reject or delete many reviews at once (Admin only)
+@router.post("/admin/reviews/bulk", response_model=schemas.BulkResult)
+def bulk_moderate_reviews(
+    bulk: schemas.ReviewBulkAction,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_admin_user)
+):
+    """Apply one moderation action to the listed reviews, or to every review matching the filter"""
+    conditions = []
+    if bulk.ids is not None:
+        conditions.append(models.Review.id.in_(bulk.ids))
+    if bulk.product_id is not None:
+        conditions.append(models.Review.product_id == bulk.product_id)
+    if bulk.is_approved is not None:
+        conditions.append(models.Review.is_approved == bulk.is_approved)
+    if bulk.max_rating is not None:
+        conditions.append(models.Review.rating <= bulk.max_rating)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="Give review ids or at least one filter")
+
+    # One UPDATE/DELETE statement, one transaction
+    if bulk.action == "delete":
+        statement = delete(models.Review).where(*conditions)
+    else:
+        statement = update(models.Review).where(*conditions).values(is_approved=bulk.action == "approve")
+    affected = db.execute(statement.execution_options(synchronize_session=False)).rowcount
+    db.commit()
+
+    return {"affected": affected}
+
 # Delete review (Admin only)
 @router.delete("/admin/reviews/{review_id}")
 def delete_review(
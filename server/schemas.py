@@ -1,5 +1,5 @@
 ﻿from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from enum import Enum
 from datetime import datetime
 
@@ -29,6 +29,29 @@ class Product(ProductBase):
     class Config:
         from_attributes = True
 
+# ?lang= / ?fields= responses: only the requested columns are present
+class ProductSparse(BaseModel):
+    id: int
+    nameBn: Optional[str] = None
+    nameEn: Optional[str] = None
+    price: Optional[float] = None
+    descriptionBn: Optional[str] = None
+    descriptionEn: Optional[str] = None
+    image: Optional[str] = None
+    category: Optional[Category] = None
+
+class ProductBatch(BaseModel):
+    products: List[Product]  # in the order requested
+    missing: List[int]
+
+class ProductBatchSparse(BaseModel):
+    products: List[ProductSparse]
+    missing: List[int]
+
+class ProductSuggestion(BaseModel):
+    id: int
+    name: str
+
 # User Schemas
 class UserLogin(BaseModel):
     username: str
@@ -91,10 +114,23 @@ class Order(BaseModel):
     items: str
     status: str = "pending"
     created_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None  # set only for orders read from orders_archive
 
     class Config:
         from_attributes = True
 
+class ArchiveRequest(BaseModel):
+    older_than_days: int = Field(90, ge=1)
+    batch_size: int = Field(1000, ge=1, le=10000)
+
+class OrderBulkStatus(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=5000)
+    status: str
+
+# Bulk endpoints return how many rows the statement touched
+class BulkResult(BaseModel):
+    affected: int
+
 # Review Schemas
 class ReviewCreate(BaseModel):
     product_id: int
@@ -104,6 +140,14 @@ class ReviewCreate(BaseModel):
 class ReviewUpdate(BaseModel):
     is_approved: bool
 
+class ReviewBulkAction(BaseModel):
+    action: str = Field(..., pattern="^(approve|reject|delete)$")
+    # Either an explicit id list, or a filter (at least one field)
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=5000)
+    product_id: Optional[int] = None
+    is_approved: Optional[bool] = None
+    max_rating: Optional[int] = Field(None, ge=1, le=5)
+
 class ReviewResponse(BaseModel):
     id: int
     product_id: int
@@ -115,4 +159,24 @@ class ReviewResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Background Job Schemas
+class JobInfo(BaseModel):
+    id: int
+    name: str
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JobQueueStatus(BaseModel):
+    counts: dict  # status -> number of jobs
+    due: int  # pending jobs whose run_at has passed
+    failures: List[JobInfo]
\ No newline at end of file
@@ -0,0 +1,145 @@
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Tuple
+import models
+
+# Every server process has its own index. Product writes bump
+# catalog_state.revision, and each process compares it with the revision its
+# index was built from at most this often (on /api/products/suggest).
+REFRESH_INTERVAL_SECONDS = float(os.getenv("PRODUCT_INDEX_REFRESH_SECONDS", "2"))
+
+# Languages we index product names for (matches Product.nameEn / Product.nameBn)
+LANGUAGES = ("en", "bn")
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+def _keys_for_name(name: str) -> List[str]:
+    # Index the full name plus every word-start suffix so "sofa" matches "Wooden Sofa Set"
+    words = normalize(name).split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+class PrefixIndex:
+    """Sorted-array prefix index over product names, one array per language."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Tuple[str, int]]] = {lang: [] for lang in LANGUAGES}
+        self._names: Dict[str, Dict[int, str]] = {lang: {} for lang in LANGUAGES}
+        # catalog_state.revision this index reflects, and when that was last checked
+        self.revision = None
+        self.checked_at = 0.0
+
+    def __len__(self):
+        return len(self._names["en"])
+
+    def build(self, products):
+        """Rebuild the whole index from an iterable of Product rows"""
+        entries = {lang: [] for lang in LANGUAGES}
+        names = {lang: {} for lang in LANGUAGES}
+        for product in products:
+            for lang, name in self._product_names(product):
+                names[lang][product.id] = name
+                entries[lang].extend((key, product.id) for key in _keys_for_name(name))
+        for lang in LANGUAGES:
+            entries[lang].sort()
+        with self._lock:
+            self._entries = entries
+            self._names = names
+
+    def add(self, product):
+        with self._lock:
+            self._remove_locked(product.id)
+            for lang, name in self._product_names(product):
+                self._names[lang][product.id] = name
+                for key in _keys_for_name(name):
+                    bisect.insort(self._entries[lang], (key, product.id))
+
+    def update(self, product):
+        self.add(product)
+
+    def remove(self, product_id: int):
+        with self._lock:
+            self._remove_locked(product_id)
+
+    def suggest(self, prefix: str, lang: str = "en", limit: int = 8) -> List[dict]:
+        """Return up to `limit` products whose name (or a word in it) starts with `prefix`"""
+        prefix = normalize(prefix)
+        if not prefix or lang not in self._entries:
+            return []
+        results = []
+        seen = set()
+        with self._lock:
+            entries = self._entries[lang]
+            names = self._names[lang]
+            i = bisect.bisect_left(entries, (prefix, -1))
+            while i < len(entries) and len(results) < limit:
+                key, product_id = entries[i]
+                if not key.startswith(prefix):
+                    break
+                if product_id not in seen:
+                    seen.add(product_id)
+                    results.append({"id": product_id, "name": names[product_id]})
+                i += 1
+        return results
+
+    def _remove_locked(self, product_id: int):
+        for lang in LANGUAGES:
+            name = self._names[lang].pop(product_id, None)
+            if name is None:
+                continue
+            entries = self._entries[lang]
+            for key in _keys_for_name(name):
+                i = bisect.bisect_left(entries, (key, product_id))
+                if i < len(entries) and entries[i] == (key, product_id):
+                    del entries[i]
+
+    @staticmethod
+    def _product_names(product):
+        return (("en", product.nameEn), ("bn", product.nameBn))
+
+# Index used by the products router, built in each server process on startup
+product_index = PrefixIndex()
+_refresh_lock = threading.Lock()
+
+def current_revision(db) -> int:
+    revision = db.query(models.CatalogState.revision).filter(models.CatalogState.id == 1).scalar()
+    return revision or 0
+
+def init_revision(db):
+    """Create the catalog_state row (run once, before workers start)"""
+    if db.query(models.CatalogState.id).filter(models.CatalogState.id == 1).first() is None:
+        db.add(models.CatalogState(id=1, revision=0))
+        db.commit()
+
+def bump_revision(db):
+    """Mark the catalog changed, in the caller's transaction"""
+    updated = db.query(models.CatalogState).filter(models.CatalogState.id == 1).update(
+        {"revision": models.CatalogState.revision + 1}, synchronize_session=False
+    )
+    if not updated:
+        db.add(models.CatalogState(id=1, revision=1))
+
+def build_product_index(db):
+    # Read the revision first: a write landing mid-build triggers another rebuild
+    revision = current_revision(db)
+    product_index.build(
+        db.query(models.Product.id, models.Product.nameEn, models.Product.nameBn).all()
+    )
+    product_index.revision = revision
+    product_index.checked_at = time.monotonic()
+
+def refresh_product_index(db):
+    """Rebuild the index if another process changed the catalog since it was built"""
+    if time.monotonic() - product_index.checked_at < REFRESH_INTERVAL_SECONDS:
+        return
+    if not _refresh_lock.acquire(blocking=False):
+        return  # another thread is already checking
+    try:
+        product_index.checked_at = time.monotonic()
+        if current_revision(db) != product_index.revision:
+            build_product_index(db)
+    finally:
+        _refresh_lock.release()
@@ -0,0 +1,141 @@
+"""Production launcher: pre-forks uvicorn workers that share one listening socket.
+
+The app is imported (and the one-time startup tasks run) in the parent before
+forking, so imports, table creation and admin seeding happen once. Workers are
+recycled after --max-requests requests and replaced by the parent. SIGTERM or
+SIGINT stops accepting new connections and lets workers drain in-flight
+requests for up to --graceful-timeout seconds. POSIX only (uses os.fork).
+
+    python serve.py --workers 4 --port 8000 --max-requests 10000
+"""
+import argparse
+import os
+import random
+import signal
+import socket
+import sys
+import time
+import traceback
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+# uvicorn's exit code when the app fails to start
+STARTUP_FAILURE = 3
+
+def run_worker(sock: socket.socket, args) -> int:
+    """Serve until shutdown; returns the worker's exit code"""
+    import uvicorn
+    from database import engine
+    from main import app
+
+    # Pooled connections were opened by the parent; never reuse them after fork
+    engine.dispose(close=False)
+
+    max_requests = None
+    if args.max_requests:
+        max_requests = args.max_requests + random.randint(0, args.max_requests_jitter)
+
+    config = uvicorn.Config(
+        app,
+        log_level=args.log_level,
+        access_log=args.access_log,
+        limit_max_requests=max_requests,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        backlog=args.backlog,
+    )
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+    return 0 if server.started else STARTUP_FAILURE
+
+def spawn_worker(sock: socket.socket, args) -> int:
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        code = 1
+        try:
+            code = run_worker(sock, args)
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+        except BaseException:
+            print(f"Worker {os.getpid()} crashed:", file=sys.stderr)
+            traceback.print_exc()
+        finally:
+            # Exit without running the parent's atexit handlers; a non-zero code
+            # makes the parent back off before respawning
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+    return pid
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=os.getenv("HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--max-requests", type=int, default=0,
+                        help="Recycle a worker after this many requests (0 = never)")
+    parser.add_argument("--max-requests-jitter", type=int, default=0,
+                        help="Random extra requests per worker so they don't all recycle at once")
+    parser.add_argument("--graceful-timeout", type=int, default=30,
+                        help="Seconds to let in-flight requests finish on shutdown")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args()
+
+    # Preload: imports, create_all and routers happen once in the parent
+    import main as app_module
+    from database import engine
+    app_module.run_startup_tasks()
+    engine.dispose()
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers (parent pid {os.getpid()})")
+
+    workers = set()
+    stopping = False
+
+    def handle_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+
+    for _ in range(args.workers):
+        workers.add(spawn_worker(sock, args))
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        workers.discard(pid)
+        if not stopping:
+            # Recycled (max requests) or crashed: replace it, backing off after a failure
+            code = os.waitstatus_to_exitcode(status)
+            if code != 0:
+                print(f"Worker {pid} exited with code {code}; restarting in 1s", file=sys.stderr)
+                time.sleep(1)
+            workers.add(spawn_worker(sock, args))
+
+    sock.close()
+    print("All workers stopped")
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
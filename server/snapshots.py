@@ -0,0 +1,216 @@
+"""Static catalog snapshots.
+
+After a product write commits, a debounced "publish_catalog" job writes the
+catalog as plain JSON files, each with a precompressed .gz copy, under
+static/catalog. Storefronts can then load it without a database query or a
+Python worker:
+
+    static/catalog/manifest.json                 current version (revalidate on every load)
+    static/catalog/<version>/products.json       same objects as GET /api/products
+    static/catalog/<version>/products.en.json    same as GET /api/products?lang=en
+    static/catalog/<version>/category-bed.json, category-bed.en.json, ...
+
+<version> is a hash of the catalog, so files under it never change and can be
+cached forever. A version directory is written under a temporary name and
+renamed into place before the manifest is swapped with os.replace(), so a
+reader never sees a half-written snapshot. Publishes take an exclusive lock on
+static/catalog/.publish.lock (POSIX), so one that read an older catalog can't
+replace the manifest of a newer one. Serve the .gz files with e.g. nginx
+`gzip_static on`.
+
+    python snapshots.py                                  # publish now
+    python snapshots.py --check http://localhost:8000    # compare with the live API
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+import models
+import schemas
+from jobs import enqueue_once
+
+try:
+    import fcntl
+except ImportError:  # Windows: publishes aren't serialized across processes
+    fcntl = None
+
+SNAPSHOT_DIR = Path(os.getenv("CATALOG_SNAPSHOT_DIR", "static/catalog"))
+SNAPSHOT_URL = "/static/catalog"
+# Edits within this window are published together
+DEBOUNCE_SECONDS = float(os.getenv("CATALOG_SNAPSHOT_DEBOUNCE_SECONDS", "2"))
+# Older versions are kept briefly for clients still holding a previous manifest
+KEEP_VERSIONS = 3
+# Level 9 costs several times the CPU of 6 for a few percent smaller files
+GZIP_LEVEL = 6
+
+LANGS = (None, "en", "bn")
+LOCALIZED_KEYS = {"en": ("nameEn", "descriptionEn"), "bn": ("nameBn", "descriptionBn")}
+
+def schedule_publish(db: Session):
+    """Queue a snapshot rebuild in the caller's transaction (runs once it commits)"""
+    enqueue_once(db, "publish_catalog", {}, delay=DEBOUNCE_SECONDS)
+
+def catalog_rows(db: Session) -> list:
+    """The catalog serialized exactly as GET /api/products returns it"""
+    products = db.query(models.Product).order_by(models.Product.id).all()
+    return [schemas.Product.model_validate(p).model_dump(mode="json") for p in products]
+
+def localize(product: dict, lang: Optional[str]) -> dict:
+    """Drop the other language's name/description, like ?lang="""
+    if lang is None:
+        return product
+    dropped = {key for other, keys in LOCALIZED_KEYS.items() if other != lang for key in keys}
+    return {key: value for key, value in product.items() if key not in dropped}
+
+def _encode(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+def _write(path: Path, body: bytes):
+    path.write_bytes(body)
+    Path(f"{path}.gz").write_bytes(gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0))
+
+def _slug(category: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]", "_", category)
+
+def read_manifest(root: Path = SNAPSHOT_DIR) -> Optional[dict]:
+    try:
+        return json.loads((root / "manifest.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+@contextmanager
+def _publish_lock(root: Path):
+    with open(root / ".publish.lock", "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+def publish(db: Session, root: Path = SNAPSHOT_DIR) -> dict:
+    """Write a snapshot of the current catalog and point the manifest at it"""
+    root.mkdir(parents=True, exist_ok=True)
+    # Read the catalog under the lock too, so the last publish has the newest one
+    with _publish_lock(root):
+        return _publish(db, root)
+
+def _publish(db: Session, root: Path) -> dict:
+    products = catalog_rows(db)
+    version = hashlib.sha256(_encode(products)).hexdigest()[:16]
+
+    current = read_manifest(root)
+    if current and current.get("version") == version and (root / version).is_dir():
+        return current
+
+    categories = sorted({p["category"] for p in products})
+    catalogs = {}
+    staging = Path(tempfile.mkdtemp(dir=root, prefix=".staging-"))
+    try:
+        for lang in LANGS:
+            suffix = f".{lang}" if lang else ""
+            rows = [localize(p, lang) for p in products]
+            _write(staging / f"products{suffix}.json", _encode(rows))
+            shards = {}
+            for category in categories:
+                name = f"category-{_slug(category)}{suffix}.json"
+                _write(staging / name, _encode([r for r in rows if r["category"] == category]))
+                shards[category] = f"{SNAPSHOT_URL}/{version}/{name}"
+            catalogs[lang or "all"] = {
+                "products": f"{SNAPSHOT_URL}/{version}/products{suffix}.json",
+                "categories": shards,
+            }
+        staging.chmod(0o755)
+        try:
+            staging.rename(root / version)
+        except OSError:
+            # Another process already published this exact version
+            shutil.rmtree(staging, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    manifest = {
+        "version": version,
+        "generated_at": datetime.utcnow().isoformat(),
+        "count": len(products),
+        "catalogs": catalogs,
+    }
+    tmp_manifest = root / f".manifest-{uuid.uuid4().hex}.json"
+    tmp_manifest.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp_manifest, root / "manifest.json")
+    _prune(root, version)
+    return manifest
+
+def _prune(root: Path, current: str):
+    versions = sorted(
+        (path for path in root.iterdir() if path.is_dir() and not path.name.startswith(".")),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True
+    )
+    for path in [p for p in versions if p.name != current][KEEP_VERSIONS - 1:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+def _get_json(url: str):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return json.load(response)
+
+def check(get_json: Callable[[str], object]) -> list:
+    """Compare the published snapshot with the live API; returns a list of differences.
+
+    get_json(path) fetches a server path such as /api/products, e.g. over HTTP
+    (see main()) or from a TestClient.
+    """
+    manifest = get_json(f"{SNAPSHOT_URL}/manifest.json")
+    problems = []
+    for lang, catalog in manifest["catalogs"].items():
+        query = "" if lang == "all" else f"?lang={lang}"
+        live = {p["id"]: p for p in get_json(f"/api/products{query}")}
+        snapshot = {p["id"]: p for p in get_json(catalog["products"])}
+        if live != snapshot:
+            changed = sorted(i for i in live.keys() | snapshot.keys() if live.get(i) != snapshot.get(i))
+            problems.append(f"{lang}: products differ from /api/products{query} for ids {changed[:20]}")
+        sharded = {}
+        for category, url in catalog["categories"].items():
+            for product in get_json(url):
+                if product["category"] != category:
+                    problems.append(f"{lang}: product {product['id']} in the {category} shard has category {product['category']}")
+                sharded[product["id"]] = product
+        if sharded != snapshot:
+            problems.append(f"{lang}: category shards don't add up to the full snapshot")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", metavar="BASE_URL", help="Compare the published snapshot with a running server")
+    args = parser.parse_args()
+
+    if args.check:
+        base_url = args.check.rstrip("/")
+        problems = check(lambda path: _get_json(f"{base_url}{path}"))
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print("✅ Snapshot matches /api/products")
+        sys.exit(1 if problems else 0)
+
+    from database import SessionLocal, engine
+    models.Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        manifest = publish(db)
+    finally:
+        db.close()
+    print(f"✅ Published catalog snapshot {manifest['version']} ({manifest['count']} products)")
+
+if __name__ == "__main__":
+    main()
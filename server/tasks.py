@@ -0,0 +1,57 @@
+import os
+from jobs import task
+from database import SessionLocal
+import archive
+import recommendations
+import snapshots
+
+# Background task handlers. Each receives the JSON payload given to jobs.enqueue()
+# and should be safe to run more than once, since failed jobs are retried.
+
+@task("delete_upload")
+def delete_upload(payload: dict):
+    """Remove a replaced or orphaned product image from static/uploads"""
+    image = payload.get("image") or ""
+    if not image.startswith("/static/uploads/"):
+        return
+    try:
+        os.remove(image.replace("/static/", "static/", 1))
+    except FileNotFoundError:
+        pass
+
+@task("archive_orders")
+def archive_orders(payload: dict):
+    """Move old completed/cancelled orders into orders_archive"""
+    db = SessionLocal()
+    try:
+        archive.archive_orders(
+            db,
+            older_than_days=payload.get("older_than_days", archive.ARCHIVE_AFTER_DAYS),
+            batch_size=payload.get("batch_size", archive.BATCH_SIZE),
+        )
+    finally:
+        db.close()
+
+@task("refresh_recommendations")
+def refresh_recommendations(payload: dict):
+    """Fold new orders into the frequently-bought-together tables"""
+    db = SessionLocal()
+    try:
+        if payload.get("full"):
+            recommendations.rebuild(db)
+        else:
+            recommendations.refresh(db)
+    except recommendations.StaleWatermark:
+        # A concurrent refresh already counted these orders
+        db.rollback()
+    finally:
+        db.close()
+
+@task("publish_catalog")
+def publish_catalog(payload: dict):
+    """Regenerate the static catalog snapshot after product writes"""
+    db = SessionLocal()
+    try:
+        snapshots.publish(db)
+    finally:
+        db.close()
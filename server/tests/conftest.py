@@ -0,0 +1,45 @@
+"""The app under test runs against a throwaway SQLite database in a temporary
+working directory (static/ and the catalog snapshots land there too).
+
+    cd server && python -m pytest -q
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+import pytest
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+WORKDIR = Path(tempfile.mkdtemp(prefix="rubel-tests-"))
+
+# database reads DATABASE_URL on import, so this has to happen first
+os.chdir(WORKDIR)
+os.environ["DATABASE_URL"] = f"sqlite:///{WORKDIR / 'test.db'}"
+os.environ.setdefault("RATE_LIMITS_ENABLED", "0")
+sys.path.insert(0, str(SERVER_DIR))
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    import main
+    with TestClient(main.app) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    token = client.post("/api/auth/login", data={"username": "admin", "password": "admin123"}).json()
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+@pytest.fixture
+def db():
+    from database import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+def pytest_sessionfinish(session, exitstatus):
+    os.chdir(SERVER_DIR)
+    shutil.rmtree(WORKDIR, ignore_errors=True)
@@ -0,0 +1,42 @@
+import time
+import pytest
+from sqlalchemy import text
+import deadlines
+import models
+from database import SessionLocal, engine
+from routers import orders
+
+# Runs for many seconds unless the deadline interrupts it
+SLOW_SQL = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n LIMIT 100000000) SELECT count(*) FROM n"
+
+ORDER = {"customer_name": "x", "customer_phone": "0123456789", "total_amount": 5, "items": "[]"}
+
+def test_idempotency_key_is_released_when_the_deadline_hits(client, admin_headers, db, monkeypatch):
+    headers = {**admin_headers, "Idempotency-Key": "deadline-retry"}
+    monkeypatch.setattr(deadlines, "REQUEST_TIMEOUT_SECONDS", 0.2)
+    monkeypatch.setattr(orders, "schedule_refresh", lambda session: session.execute(text(SLOW_SQL)))
+
+    response = client.post("/api/orders", json=ORDER, headers=headers)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert db.query(models.IdempotencyKey).filter(models.IdempotencyKey.key.like("%:deadline-retry")).count() == 0
+    # The interrupted request gave its connection back to the pool (the test's
+    # own session returns the one it just used first)
+    db.rollback()
+    assert engine.pool.checkedout() == 0
+    assert client.get("/api/products").status_code == 200
+
+    monkeypatch.undo()
+    assert client.post("/api/orders", json=ORDER, headers=headers).status_code == 200
+
+def test_slow_statement_is_interrupted_at_the_deadline(client):
+    with engine.connect() as conn:
+        session = SessionLocal(bind=conn)
+        session.info["deadline"] = deadlines.Deadline(0.2)
+        started = time.monotonic()
+        with pytest.raises(deadlines.DeadlineExceeded):
+            session.execute(text(SLOW_SQL))
+        assert time.monotonic() - started < 2
+        # Other handle_error listeners still ran (profiling dropped its timer)
+        assert not conn.info.get("query_start")
+        session.close()
@@ -0,0 +1,73 @@
+import asyncio
+import json
+from sqlalchemy.exc import OperationalError
+import models
+from database import SessionLocal
+from events import EventBroker, order_events
+
+def publish(broker, event_type, data):
+    db = SessionLocal()
+    try:
+        broker.add(db, event_type, data)
+        db.commit()
+    finally:
+        db.close()
+    broker.notify()
+
+def test_events_reach_subscribers_of_other_processes(client):
+    # Two brokers on one stream stand in for two worker processes
+    worker_a = EventBroker("test-fanout")
+    worker_b = EventBroker("test-fanout")
+    worker_a.poll()
+    worker_b.poll()
+
+    async def scenario():
+        subscription = worker_b.subscribe()
+        publish(worker_a, "order_created", {"id": 1})
+        publish(worker_a, "order_updated", {"id": 1})
+        assert worker_b.poll() == 2
+        first = await asyncio.wait_for(subscription.queue.get(), 1)
+        second = await asyncio.wait_for(subscription.queue.get(), 1)
+        worker_b.unsubscribe(subscription)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert (first.type, second.type) == ("order_created", "order_updated")
+    assert first.seq < second.seq
+
+def test_resume_on_another_worker(client):
+    worker_a = EventBroker("test-resume")
+    worker_b = EventBroker("test-resume")
+    worker_a.poll()
+    worker_b.poll()
+    for order_id in range(3):
+        publish(worker_a, "order_created", {"id": order_id})
+    worker_b.poll()
+    seen_on_a = list(worker_a._history)
+
+    async def resume(last_event_id):
+        subscription = worker_b.subscribe(last_event_id)
+        worker_b.unsubscribe(subscription)
+        return subscription.backlog
+
+    # A client that saw the first event on worker A gets the rest from worker B
+    backlog = asyncio.run(resume(seen_on_a[0].id))
+    assert [event.id for event in backlog] == [event.id for event in seen_on_a[1:]]
+    # Ids from before the event ids were row ids can't be resumed
+    backlog = asyncio.run(resume("0a1b2c3d-7"))
+    assert [event.type for event in backlog] == ["reset"]
+
+def test_order_event_commits_with_the_order(client, admin_headers, db, monkeypatch):
+    def locked():
+        raise OperationalError("SELECT", {}, Exception("database is locked"))
+    monkeypatch.setattr(order_events, "poll", locked)
+
+    response = client.post("/api/orders", json={
+        "customer_name": "x", "customer_phone": "0123456789", "total_amount": 5, "items": "[]"
+    }, headers=admin_headers)
+    # Delivering the event failed after the commit; the order still succeeded
+    assert response.status_code == 200
+    order_id = response.json()["order_id"]
+    created = [json.loads(row.data)["id"] for row in db.query(models.StreamEvent).filter(
+        models.StreamEvent.stream == "orders", models.StreamEvent.type == "order_created")]
+    assert order_id in created
@@ -0,0 +1,59 @@
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import models
+import idempotency
+
+def order_payload(customer_name: str) -> dict:
+    return {
+        "customer_name": customer_name,
+        "customer_phone": "01700000000",
+        "customer_address": "Test Road, Dhaka",
+        "total_amount": 1000.0,
+        "items": json.dumps([{"id": 1, "name": "Bed", "price": 1000.0, "quantity": 1}]),
+    }
+
+def post_order(client, headers, key, payload):
+    return client.post("/api/orders", json=payload, headers={**headers, "Idempotency-Key": key})
+
+def test_concurrent_duplicates_create_one_order_per_key(client, admin_headers, db):
+    customer = f"concurrent-{uuid.uuid4()}"
+    payload = order_payload(customer)
+    keys = [str(uuid.uuid4()) for _ in range(20)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for key in keys:
+            responses = list(pool.map(lambda _: post_order(client, admin_headers, key, payload), range(8)))
+            assert {r.status_code for r in responses} <= {200, 409}
+            order_ids = {r.json()["order_id"] for r in responses if r.status_code == 200}
+            assert len(order_ids) == 1, f"key {key} answered with orders {order_ids}"
+
+    written = db.query(models.Order).filter(models.Order.customer_name == customer).count()
+    assert written == len(keys)
+
+def test_same_key_with_different_body_is_rejected(client, admin_headers):
+    key = str(uuid.uuid4())
+    assert post_order(client, admin_headers, key, order_payload("first")).status_code == 200
+    assert post_order(client, admin_headers, key, order_payload("second")).status_code == 422
+
+def test_stale_claim_is_taken_over_after_the_lease(client, admin_headers, db):
+    customer = f"stale-{uuid.uuid4()}"
+    fresh_key, stale_key = str(uuid.uuid4()), str(uuid.uuid4())
+    now = datetime.utcnow()
+    # Claims left behind by a worker that died before committing its order
+    db.add_all([
+        models.IdempotencyKey(key=f"1:{fresh_key}", request_hash="x", status="in_progress", created_at=now),
+        models.IdempotencyKey(
+            key=f"1:{stale_key}", request_hash="x", status="in_progress",
+            created_at=now - timedelta(seconds=idempotency.CLAIM_LEASE_SECONDS + 1)
+        ),
+    ])
+    db.commit()
+
+    assert post_order(client, admin_headers, fresh_key, order_payload(customer)).status_code == 409
+    response = post_order(client, admin_headers, stale_key, order_payload(customer))
+    assert response.status_code == 200
+    replay = post_order(client, admin_headers, stale_key, order_payload(customer))
+    assert replay.json()["order_id"] == response.json()["order_id"]
+    assert db.query(models.Order).filter(models.Order.customer_name == customer).count() == 1
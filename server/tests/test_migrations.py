@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
+import models
+import migrations
+from archive import archive_orders
+
+LEGACY_ORDERS = """CREATE TABLE orders (
+    id INTEGER NOT NULL PRIMARY KEY, user_id INTEGER, customer_name VARCHAR NOT NULL,
+    customer_phone VARCHAR NOT NULL, customer_address VARCHAR, total_amount FLOAT NOT NULL,
+    items VARCHAR, status VARCHAR, created_at DATETIME
+)"""
+
+def old_order(**kwargs):
+    return models.Order(customer_name="x", customer_phone="0123456789", total_amount=5,
+                        status="completed", created_at=datetime.utcnow() - timedelta(days=400), **kwargs)
+
+def test_orders_rebuilt_without_id_reuse(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE orders"))
+        conn.execute(text(LEGACY_ORDERS))
+        conn.execute(text("CREATE INDEX ix_orders_created_at ON orders (created_at)"))
+        conn.execute(text("INSERT INTO orders (id, customer_name, customer_phone, total_amount) VALUES (1, 'a', '1', 5), (2, 'b', '2', 5)"))
+        conn.execute(text("INSERT INTO orders_archive (id, customer_name, customer_phone, total_amount, status) VALUES (3, 'c', '3', 5, 'completed')"))
+
+    assert 5 in migrations.upgrade(engine)
+    with engine.begin() as conn:
+        assert "AUTOINCREMENT" in conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'orders'")).scalar()
+        assert [row[0] for row in conn.execute(text("SELECT customer_name FROM orders ORDER BY id"))] == ["a", "b"]
+        new_id = conn.execute(text("INSERT INTO orders (customer_name, customer_phone, total_amount) VALUES ('d', '4', 5)")).lastrowid
+    assert new_id == 4
+    engine.dispose()
+
+def legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE orders"))
+        conn.execute(text(LEGACY_ORDERS))
+        conn.execute(text("CREATE INDEX ix_orders_created_at ON orders (created_at)"))
+    return engine
+
+def table_names(conn) -> set:
+    return {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+
+def test_failed_rebuild_leaves_orders_untouched(tmp_path, monkeypatch):
+    engine = legacy_engine(tmp_path)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO orders (id, customer_name, customer_phone, total_amount) VALUES (1, 'a', '1', 5), (2, 'b', '2', 5)"))
+    # Make the copy into the new table fail after the DDL has run
+    monkeypatch.setattr(migrations, "ORDERS_AUTOINCREMENT_DDL", migrations.ORDERS_AUTOINCREMENT_DDL + [
+        "CREATE TRIGGER fail_copy BEFORE INSERT ON orders BEGIN SELECT RAISE(ABORT, 'copy failed'); END"
+    ])
+
+    assert 5 not in migrations.upgrade(engine)
+    with engine.begin() as conn:
+        assert "orders_rebuild" not in table_names(conn)
+        assert "AUTOINCREMENT" not in conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'orders'")).scalar()
+        assert conn.execute(text("SELECT count(*) FROM orders")).scalar() == 2
+        assert conn.execute(text("SELECT count(*) FROM sqlite_master WHERE name = 'ix_orders_created_at'")).scalar() == 1
+    engine.dispose()
+
+def test_interrupted_rebuild_is_finished(tmp_path):
+    engine = legacy_engine(tmp_path)
+    with engine.begin() as conn:
+        # What a rebuild that died after creating the new table left behind
+        conn.execute(text("INSERT INTO orders (id, customer_name, customer_phone, total_amount) VALUES (1, 'a', '1', 5), (2, 'b', '2', 5)"))
+        conn.execute(text("DROP INDEX ix_orders_created_at"))
+        conn.execute(text("ALTER TABLE orders RENAME TO orders_rebuild"))
+        for statement in migrations.ORDERS_AUTOINCREMENT_DDL:
+            conn.execute(text(statement))
+
+    assert 5 in migrations.upgrade(engine)
+    with engine.begin() as conn:
+        assert "orders_rebuild" not in table_names(conn)
+        assert [row[0] for row in conn.execute(text("SELECT customer_name FROM orders ORDER BY id"))] == ["a", "b"]
+    engine.dispose()
+
+def test_archiving_the_newest_order_twice(client, db):
+    order = old_order()
+    db.add(order)
+    db.commit()
+    archived_id = order.id
+    archive_orders(db)
+
+    replacement = old_order()
+    db.add(replacement)
+    db.commit()
+    new_id = replacement.id
+    assert new_id > archived_id
+    archive_orders(db)
+    assert db.query(models.OrderArchive).filter(models.OrderArchive.id.in_([archived_id, new_id])).count() == 2
@@ -0,0 +1,43 @@
+import json
+from datetime import datetime, timedelta
+import models
+from profiling import query_budget
+
+def test_archived_orders_are_merged_newest_first_and_paged(client, admin_headers, db):
+    token = client.post("/api/auth/register", json={"username": "paged-history", "password": "secret123"}).json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+    user = db.query(models.User).filter(models.User.username == "paged-history").one()
+    now = datetime.utcnow()
+    for days in range(6):
+        model = models.OrderArchive if days % 2 else models.Order
+        db.add(model(user_id=user.id, customer_name=f"paged {days}", customer_phone="0123456789",
+                     total_amount=5, items="[]", status="completed", created_at=now - timedelta(days=days)))
+    db.commit()
+
+    pages = []
+    for offset in range(0, 8, 2):
+        response = client.get(f"/api/my-orders?include_archived=true&limit=2&offset={offset}", headers=headers)
+        assert response.status_code == 200
+        pages.append(response.json())
+    assert [len(page) for page in pages] == [2, 2, 2, 0]
+    merged = [order for page in pages for order in page]
+    assert [order["customer_name"] for order in merged] == [f"paged {days}" for days in range(6)]
+    assert [order["archived_at"] is not None for order in merged] == [bool(days % 2) for days in range(6)]
+
+    assert client.get("/api/orders?include_archived=true&limit=1000", headers=admin_headers).status_code == 422
+
+def test_bulk_status_runs_a_fixed_number_of_statements(client, admin_headers, db):
+    orders = [models.Order(customer_name=f"bulk {n}", customer_phone="0123456789", total_amount=5,
+                           items="[]", status="pending") for n in range(20)]
+    db.add_all(orders)
+    db.commit()
+    ids = [order.id for order in orders]
+
+    # Admin lookup, UPDATE, SELECT of the updated orders, one INSERT of their
+    # events, and the post-commit poll
+    with query_budget(5) as stats:
+        response = client.post("/api/orders/bulk-status", json={"ids": ids, "status": "processing"}, headers=admin_headers)
+    assert response.json() == {"affected": 20}
+    updated = db.query(models.StreamEvent).filter(models.StreamEvent.type == "order_updated").order_by(
+        models.StreamEvent.id.desc()).limit(20).all()
+    assert sorted(json.loads(row.data)["id"] for row in updated) == ids
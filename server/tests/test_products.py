@@ -0,0 +1,15 @@
+import models
+
+def test_sparse_products_are_documented_and_served(client, db):
+    product = models.Product(nameEn="Sparse Bed", nameBn="Sparse Bed", price=10, image="/static/uploads/x.png", category="bed")
+    db.add(product)
+    db.commit()
+
+    full = client.get(f"/api/products/{product.id}").json()
+    assert set(full) == {"id", "nameBn", "nameEn", "price", "descriptionBn", "descriptionEn", "image", "category"}
+    assert client.get(f"/api/products/{product.id}?lang=en&fields=id,name").json() == {"id": product.id, "nameEn": "Sparse Bed"}
+
+    paths = client.get("/openapi.json").json()["paths"]
+    for path in ("/api/products", "/api/products/{product_id}", "/api/products/batch"):
+        schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert "Sparse" in str(schema["anyOf"][1]), path
@@ -0,0 +1,22 @@
+from sqlalchemy import text
+import models
+from profiling import query_budget
+
+def test_product_reviews_fit_a_query_budget(client, db):
+    product = models.Product(nameEn="Budget Bed", nameBn="খাট", price=10, image="/static/uploads/x.png", category="bed")
+    db.add(product)
+    db.flush()
+    for n in range(3):
+        user = models.User(username=f"budget-reviewer-{n}", hashed_password="x", is_admin=False)
+        db.add(user)
+        db.flush()
+        db.add(models.Review(product_id=product.id, user_id=user.id, rating=5, comment="ok", is_approved=True))
+    db.commit()
+
+    with query_budget(1) as stats:
+        response = client.get(f"/api/products/{product.id}/reviews")
+        # Statements outside a request (tests, background threads) aren't counted
+        db.execute(text("SELECT 1"))
+    assert response.status_code == 200
+    assert sorted(review["username"] for review in response.json()) == [f"budget-reviewer-{n}" for n in range(3)]
+    assert stats.count == 1
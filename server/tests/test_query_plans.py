@@ -0,0 +1,36 @@
+"""The busiest endpoints' queries must be served from an index (SQLite plans).
+
+The queries come from the same helpers the routers execute, so a change to a
+router's query is checked here without repeating it.
+"""
+import pytest
+from sqlalchemy import text
+import models
+from routers import orders, reviews
+
+HOT_QUERIES = {
+    "get_orders": lambda: orders.orders_query(),
+    "get_orders ?include_archived": lambda: orders.orders_with_archived_query(),
+    "get_my_orders": lambda: orders.orders_query(user_id=1),
+    "get_my_orders ?include_archived": lambda: orders.orders_with_archived_query(user_id=1),
+    "get_stats customers": lambda: orders.customer_count_query(),
+    "get_product_reviews": lambda: reviews.approved_reviews_query(1),
+}
+
+def full_scans(plan: list) -> list:
+    """Plan steps that read a whole table or sort without an index"""
+    tables = models.Base.metadata.tables
+    return [
+        step for step in plan
+        if (step.startswith("SCAN ") and step.split()[1] in tables and " USING " not in step)
+        or "TEMP B-TREE FOR ORDER BY" in step
+    ]
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_an_index(client, db, name):
+    bind = db.get_bind()
+    if bind.dialect.name != "sqlite":
+        pytest.skip("query plans are checked on SQLite")
+    sql = str(HOT_QUERIES[name]().compile(bind, compile_kwargs={"literal_binds": True}))
+    plan = [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    assert not full_scans(plan), "\n".join(plan)
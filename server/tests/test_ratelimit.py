@@ -0,0 +1,26 @@
+import ratelimit
+from routers import auth
+
+def test_failed_logins_for_one_account_are_limited_across_ips(client, monkeypatch):
+    client.post("/api/auth/register", json={"username": "sprayed", "password": "right-password"})
+    monkeypatch.setattr(ratelimit, "RATE_LIMITS_ENABLED", True)
+    monkeypatch.setattr(ratelimit, "TRUST_PROXY_HEADERS", True)
+    monkeypatch.setattr(auth, "login_account_limiter",
+                        ratelimit.TokenBucketLimiter("login_account", rate_per_minute=1, burst=3))
+
+    def login(password, ip):
+        return client.post("/api/auth/login", data={"username": "sprayed", "password": password},
+                           headers={"X-Forwarded-For": ip}).status_code
+
+    # Each IP is well inside its own username+IP bucket
+    assert [login("wrong", f"10.0.0.{n}") for n in range(3)] == [401, 401, 401]
+    assert login("wrong", "10.0.0.9") == 429
+    assert login("right-password", "10.0.0.10") == 429
+
+def test_successful_logins_spend_no_account_tokens(client, monkeypatch):
+    client.post("/api/auth/register", json={"username": "regular", "password": "right-password"})
+    monkeypatch.setattr(ratelimit, "RATE_LIMITS_ENABLED", True)
+    monkeypatch.setattr(auth, "login_account_limiter",
+                        ratelimit.TokenBucketLimiter("login_account", rate_per_minute=1, burst=2))
+    for _ in range(4):
+        assert client.post("/api/auth/login", data={"username": "regular", "password": "right-password"}).status_code == 200
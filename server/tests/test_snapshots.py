@@ -0,0 +1,53 @@
+import threading
+import time
+import models
+import snapshots
+from database import SessionLocal
+
+def add_product(db, name):
+    product = models.Product(nameEn=name, nameBn=name, price=10, image="/static/uploads/x.png", category="bed")
+    db.add(product)
+    db.commit()
+    return product
+
+def test_published_snapshot_matches_the_api(client, db):
+    get_json = lambda path: client.get(path).json()
+    add_product(db, "Snapshot Bed")
+    snapshots.publish(db)
+    assert snapshots.check(get_json) == []
+
+    add_product(db, "Unpublished Bed")
+    assert snapshots.check(get_json)
+
+def test_an_older_publish_does_not_replace_a_newer_manifest(client, db, monkeypatch):
+    catalog_rows = snapshots.catalog_rows
+    first_read = threading.Event()
+    release = threading.Event()
+
+    def slow_first_read(session):
+        rows = catalog_rows(session)
+        if not first_read.is_set():
+            first_read.set()
+            release.wait(5)
+        return rows
+
+    def publish():
+        session = SessionLocal()
+        try:
+            snapshots.publish(session)
+        finally:
+            session.close()
+
+    monkeypatch.setattr(snapshots, "catalog_rows", slow_first_read)
+    older = threading.Thread(target=publish)
+    older.start()
+    first_read.wait(5)
+    add_product(db, "Newer Bed")
+    newer = threading.Thread(target=publish)
+    newer.start()
+    time.sleep(0.3)
+    release.set()
+    older.join(10)
+    newer.join(10)
+
+    assert snapshots.read_manifest()["count"] == db.query(models.Product).count()
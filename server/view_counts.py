@@ -0,0 +1,146 @@
+"""Write-behind product view counters.
+
+GET /api/products/{id} only bumps an in-memory counter. A background thread
+folds the accumulated deltas into product_stats every few seconds in one
+transaction, and once more on shutdown, so the hottest read never writes to
+the database. Each server process keeps its own counters and adds its own
+deltas, so several workers can flush into the same table. Views recorded
+since the last flush are lost if a process is killed outright.
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict
+from sqlalchemy import bindparam, update
+from sqlalchemy.exc import IntegrityError
+import metrics
+import models
+from database import SessionLocal
+
+logger = logging.getLogger("view_counts")
+
+FLUSH_INTERVAL_SECONDS = float(os.getenv("VIEW_COUNTS_FLUSH_SECONDS", "5"))
+# Products are spread over this many dict+lock pairs so concurrent requests
+# for different products rarely wait on each other
+SHARDS = 16
+
+product_views_total = metrics.registry.register(metrics.Counter(
+    "product_views_total", "Product detail views recorded"))
+view_count_flush_seconds = metrics.registry.register(metrics.Histogram(
+    "view_count_flush_seconds", "Time spent writing view count deltas to product_stats"))
+
+class ViewCounter:
+    def __init__(self, shards: int = SHARDS, interval: float = FLUSH_INTERVAL_SECONDS):
+        self.interval = interval
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._counts = [{} for _ in range(shards)]
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def record(self, product_id: int):
+        shard = product_id % len(self._locks)
+        with self._locks[shard]:
+            counts = self._counts[shard]
+            counts[product_id] = counts.get(product_id, 0) + 1
+
+    def pending(self) -> Dict[int, int]:
+        """Views not yet written to the database"""
+        totals = Counter()
+        for shard, lock in enumerate(self._locks):
+            with lock:
+                totals.update(self._counts[shard])
+        return dict(totals)
+
+    def _drain(self) -> Counter:
+        deltas = Counter()
+        for shard, lock in enumerate(self._locks):
+            with lock:
+                counts, self._counts[shard] = self._counts[shard], {}
+            deltas.update(counts)
+        return deltas
+
+    def _restore(self, deltas: Counter):
+        for product_id, views in deltas.items():
+            shard = product_id % len(self._locks)
+            with self._locks[shard]:
+                counts = self._counts[shard]
+                counts[product_id] = counts.get(product_id, 0) + views
+
+    def flush(self) -> int:
+        """Add pending views to product_stats in one transaction; returns products updated"""
+        with self._flush_lock:
+            deltas = self._drain()
+            if not deltas:
+                return 0
+            start = time.perf_counter()
+            try:
+                try:
+                    written = self._write(deltas)
+                except IntegrityError:
+                    # Another process inserted one of the new rows first; they exist now
+                    written = self._write(deltas)
+            except Exception:
+                self._restore(deltas)
+                raise
+            finally:
+                view_count_flush_seconds.observe(value=time.perf_counter() - start)
+            product_views_total.inc(amount=sum(deltas.values()))
+            return written
+
+    def _write(self, deltas: Counter) -> int:
+        db = SessionLocal()
+        try:
+            ids = list(deltas)
+            # Views of products deleted since they were recorded are dropped
+            live = {row.id for row in db.query(models.Product.id).filter(models.Product.id.in_(ids))}
+            existing = {row.product_id for row in db.query(models.ProductStats.product_id).filter(
+                models.ProductStats.product_id.in_(ids))}
+            now = datetime.utcnow()
+            updates = [
+                {"pid": product_id, "delta": deltas[product_id], "now": now}
+                for product_id in ids if product_id in existing
+            ]
+            inserts = [
+                {"product_id": product_id, "views": deltas[product_id], "updated_at": now}
+                for product_id in ids if product_id in live and product_id not in existing
+            ]
+            if updates:
+                table = models.ProductStats.__table__
+                db.execute(
+                    update(table)
+                    .where(table.c.product_id == bindparam("pid"))
+                    .values(views=table.c.views + bindparam("delta"), updated_at=bindparam("now")),
+                    updates,
+                )
+            if inserts:
+                db.execute(models.ProductStats.__table__.insert(), inserts)
+            db.commit()
+            return len(updates) + len(inserts)
+        finally:
+            db.close()
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="view-count-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        """Stop the flusher thread and write whatever is still pending"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to flush product view counts")
+
+view_counter = ViewCounter()
@@ -49,6 +49,10 @@ export default defineConfig({
         target: "http://localhost:8000",
         changeOrigin: true,
       },
+      "/static": {
+        target: "http://localhost:8000",
+        changeOrigin: true,
+      },
     },
     fs: {
       strict: true,